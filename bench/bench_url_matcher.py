@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark: URLMatcher vs a re.search() loop per request event
+
+Matches a synthetic stream of page traffic (images, scripts, API calls,
+fonts, segments and about 2% playlists) against the default
+m3u8_patterns, the way the request and response listeners do for every
+event.
+
+Usage:
+    python bench/bench_url_matcher.py [events]
+"""
+
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from m3u8_extractor import M3U8Extractor, URLMatcher  # noqa: E402
+
+TRAFFIC = [
+    'https://cdn.example.com/static/img/%d.png',
+    'https://cdn.example.com/js/app.%d.js',
+    'https://api.example.com/v1/events?id=%d',
+    'https://fonts.gstatic.com/s/roboto/v%d.woff2',
+    'https://edge.example/hls/seg%d.ts',
+]
+
+
+def make_urls(events: int):
+    random.seed(1)
+    playlists = events // 50
+    urls = [random.choice(TRAFFIC) % i for i in range(events - playlists)]
+    urls += [f'https://edge.example/live/{i}/index.m3u8?e={i}' for i in range(playlists)]
+    random.shuffle(urls)
+    return urls
+
+
+def main():
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    patterns = M3U8Extractor().config['m3u8_patterns']
+    urls = make_urls(events)
+
+    def search_loop(url):
+        return any(re.search(pattern, url, re.IGNORECASE) for pattern in patterns)
+
+    matcher = URLMatcher(patterns)
+    assert [search_loop(url) for url in urls] == [matcher.search(url) for url in urls]
+
+    for label, search in (('re.search loop', search_loop), ('URLMatcher', matcher.search)):
+        elapsed = min(timeit.repeat(lambda: [search(url) for url in urls], number=1, repeat=5))
+        print(f'{label:15} {elapsed * 1000:7.1f} ms   {elapsed / events * 1e9:6.0f} ns/event')
+
+
+if __name__ == '__main__':
+    main()
@@ -5,76 +5,396 @@ Python Example: Extract M3U8 from streamed.pk live matches
 This example shows how to:
 1. Fetch live matches from streamed.pk API
 2. Get embed URLs for each source
-3. Extract M3U8 URLs in parallel
-4. Filter and format results
+3. Extract M3U8 URLs in parallel, starting as soon as each embed URL is known
+4. Skip sources unchanged since the previous run, carrying their results forward
+5. Filter and format results
 """
 
 import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
 import aiohttp
-from m3u8_extractor import M3U8Extractor
+from m3u8_extractor import M3U8Extractor, asset_freshness, playlist_expiry
 
+# API location (override with STREAMED_API, e.g. to point at a local mirror)
+API_BASE = os.environ.get('STREAMED_API', 'https://streamed.pk').rstrip('/')
 
-async def get_streamed_matches():
+# Stream discovery: parallel lookups, per-request timeout (s) and retries
+CONCURRENCY = 20
+REQUEST_TIMEOUT = 10
+RETRIES = 2
+RETRY_BACKOFF = 0.5
+
+# HTTP cache for API responses, shared by every process using the same
+# directory (None disables it). Freshness per endpoint (s) when the API
+# sends no Cache-Control max-age or Expires; stale entries are revalidated
+API_CACHE_DIR = os.environ.get('STREAMED_API_CACHE', '.streamed_api_cache')
+API_TTLS = {
+    '/api/matches/live': 60,
+    '/api/stream/': 300
+}
+
+# Overlap discovery and extraction (see extract_streams)
+PIPELINE = True
+
+# Only extract sources that changed since the previous run's catalog snapshot.
+# Results whose playlist URL carries no expiry are re-extracted after
+# SNAPSHOT_MAX_AGE seconds (like the extractor's result_cache_ttl)
+INCREMENTAL = True
+SNAPSHOT_PATH = os.environ.get('STREAMED_SNAPSHOT', 'streamed_snapshot.json')
+SNAPSHOT_MAX_AGE = 300
+
+
+def make_session(concurrency: int = CONCURRENCY) -> aiohttp.ClientSession:
+    """HTTP session with a connection pool sized for `concurrency` lookups"""
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+class StreamedAPI:
+    """
+    streamed.pk API client with an HTTP cache on disk
+
+    Responses are stored in `cache_dir` (one JSON file per URL), so separate
+    processes and cron runs share them. A cached body is served without a
+    request while fresh: for the lifetime its Cache-Control / Expires headers
+    give (read by m3u8_extractor.asset_freshness, like the asset cache),
+    otherwise for the endpoint's entry in API_TTLS. Stale entries are
+    revalidated with If-None-Match / If-Modified-Since, and a 304 reuses
+    the cached body. no-store, private and Vary (other than Accept-Encoding)
+    responses are never cached.
+
+    Usage:
+        async with StreamedAPI() as api:
+            matches = await api.get_json('/api/matches/live')
+    """
+
+    def __init__(self, api_base: str = API_BASE, concurrency: int = CONCURRENCY,
+                 cache_dir: Optional[str] = API_CACHE_DIR, retries: int = RETRIES):
+        self.api_base = api_base
+        self.concurrency = concurrency
+        self.cache_dir = cache_dir
+        self.retries = retries
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.stats = {
+            'requests': 0,
+            'fresh_hits': 0,
+            'revalidated': 0,
+            'downloads': 0,
+            'bytes_downloaded': 0,
+            'bytes_saved': 0
+        }
+
+    async def __aenter__(self):
+        self.session = make_session(self.concurrency)
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    def _cache_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _load(self, url: str) -> Optional[Dict]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(url)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, url: str, entry: Dict):
+        if not self.cache_dir:
+            return
+        path = self._cache_path(url)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _endpoint_ttl(path: str) -> float:
+        for prefix, ttl in API_TTLS.items():
+            if path.startswith(prefix):
+                return ttl
+        return 0
+
+    def _freshness(self, path: str, headers) -> Optional[float]:
+        """Seconds a response stays fresh, or None if it must not be stored"""
+        return asset_freshness(headers, default=self._endpoint_ttl(path))
+
+    async def _request(self, url: str, headers: Dict):
+        """GET with retries on timeouts, connection errors and 5xx responses"""
+        for attempt in range(self.retries + 1):
+            try:
+                async with self.session.get(url, headers=headers) as resp:
+                    if resp.status < 500:
+                        if resp.status != 304:
+                            resp.raise_for_status()
+                        return resp.status, resp.headers, await resp.read()
+                    error = aiohttp.ClientResponseError(resp.request_info, resp.history, status=resp.status)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+                error = exc
+
+            if attempt < self.retries:
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+        raise error
+
+    async def get_json(self, path: str):
+        """
+        GET an API document, served from the cache when possible
+
+        Args:
+            path: Endpoint path, e.g. '/api/matches/live'
+
+        Returns:
+            Parsed JSON body
+        """
+        url = f'{self.api_base}{path}'
+        entry = self._load(url)
+        if entry and entry['expires'] > time.time():
+            self.stats['fresh_hits'] += 1
+            self.stats['bytes_saved'] += len(entry['body'])
+            return json.loads(entry['body'])
+
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('lastModified'):
+            headers['If-Modified-Since'] = entry['lastModified']
+
+        self.stats['requests'] += 1
+        status, response_headers, body = await self._request(url, headers)
+        freshness = self._freshness(path, response_headers)
+
+        if status == 304 and entry:
+            self.stats['revalidated'] += 1
+            self.stats['bytes_saved'] += len(entry['body'])
+            if freshness is not None:
+                self._store(url, {**entry, 'expires': time.time() + freshness})
+            return json.loads(entry['body'])
+
+        text = body.decode('utf-8')
+        self.stats['downloads'] += 1
+        self.stats['bytes_downloaded'] += len(body)
+        if freshness is not None:
+            self._store(url, {
+                'body': text,
+                'etag': response_headers.get('ETag'),
+                'lastModified': response_headers.get('Last-Modified'),
+                'expires': time.time() + freshness
+            })
+        return json.loads(text)
+
+    async def live_matches(self):
+        """List of live matches"""
+        return await self.get_json('/api/matches/live')
+
+    async def stream(self, source: str, source_id: str):
+        """Stream data for one source of a match"""
+        return await self.get_json(f'/api/stream/{source}/{source_id}')
+
+    def summary(self) -> str:
+        """One-line cache effectiveness report"""
+        lookups = self.stats['fresh_hits'] + self.stats['requests']
+        served = self.stats['fresh_hits'] + self.stats['revalidated']
+        return (f'API cache: {served}/{lookups} served from cache '
+                f'({self.stats["fresh_hits"]} fresh, {self.stats["revalidated"]} revalidated), '
+                f'{self.stats["downloads"]} downloaded ({self.stats["bytes_downloaded"]} bytes), '
+                f'{self.stats["bytes_saved"]} bytes saved')
+
+
+async def resolve_stream(api: StreamedAPI, semaphore: asyncio.Semaphore, source: str, source_id: str):
+    """Fetch stream data for one source, or None if the lookup failed"""
+    async with semaphore:
+        try:
+            return await api.stream(source, source_id)
+        except Exception:
+            # Skip failed sources
+            return None
+
+
+async def resolve_streams(api: StreamedAPI, pairs, concurrency: int = CONCURRENCY):
+    """
+    Resolve stream data for (source, id) pairs with bounded concurrency
+
+    Args:
+        api: Open API client
+        pairs: Iterable of (source, id) tuples, duplicates are fetched once
+        concurrency: Max stream lookups in flight
+
+    Returns:
+        dict: (source, id) -> stream data list, or None if the lookup failed
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    unique = list(dict.fromkeys(pairs))
+    resolved = await asyncio.gather(*(resolve_stream(api, semaphore, source, source_id)
+                                      for source, source_id in unique))
+    return dict(zip(unique, resolved))
+
+
+def source_entry(match, source, stream_data):
+    """Build the source record for a match, or None if it has no embed URL"""
+    if stream_data and len(stream_data) > 0 and stream_data[0].get('embedUrl'):
+        return {
+            'match': match['title'],
+            'source': source['source'],
+            'sourceId': source['id'],
+            'embedUrl': stream_data[0]['embedUrl'],
+            'category': match.get('category', 'Other'),
+            'startTime': match.get('startTime')
+        }
+    return None
+
+
+async def get_streamed_matches(api_base: str = API_BASE, concurrency: int = CONCURRENCY):
     """Fetch live matches from streamed.pk API"""
     print('Fetching live matches from streamed.pk...\n')
 
-    async with aiohttp.ClientSession() as session:
+    async with StreamedAPI(api_base, concurrency) as api:
         # Fetch live matches
-        async with session.get('https://streamed.pk/api/matches/live') as resp:
-            matches = await resp.json()
+        matches = await api.live_matches()
 
         print(f'Found {len(matches)} live matches')
 
+        # Resolve stream data for every source in parallel
+        pairs = [(source['source'], source['id'])
+                 for match in matches for source in match.get('sources') or []]
+        start_time = time.time()
+        streams = await resolve_streams(api, pairs, concurrency)
+        elapsed = time.time() - start_time
+
+        print(f'Resolved {len(streams)} unique sources ({len(pairs)} listed) in {elapsed:.2f}s '
+              f'({len(streams) / elapsed if elapsed else 0:.1f} lookups/s)')
+        print(api.summary())
+
         # Collect all sources with embed URLs
         sources = []
 
         for match in matches:
-            if not match.get('sources'):
-                continue
-
-            for source in match['sources']:
-                try:
-                    # Get stream data for this source
-                    url = f'https://streamed.pk/api/stream/{source["source"]}/{source["id"]}'
-                    async with session.get(url) as stream_resp:
-                        stream_data = await stream_resp.json()
-
-                        if stream_data and len(stream_data) > 0 and stream_data[0].get('embedUrl'):
-                            sources.append({
-                                'match': match['title'],
-                                'source': source['source'],
-                                'sourceId': source['id'],
-                                'embedUrl': stream_data[0]['embedUrl'],
-                                'category': match.get('category', 'Other'),
-                                'startTime': match.get('startTime')
-                            })
-                except Exception:
-                    # Skip failed sources
-                    pass
+            for source in match.get('sources') or []:
+                entry = source_entry(match, source, streams.get((source['source'], source['id'])))
+                if entry:
+                    sources.append(entry)
 
         print(f'Found {len(sources)} sources with embed URLs\n')
         return sources
 
 
-async def extract_streams():
-    """Extract M3U8 streams from streamed.pk"""
+async def iter_streamed_sources(api_base: str = API_BASE, concurrency: int = CONCURRENCY):
+    """
+    Yield sources with embed URLs as soon as their stream data resolves
+
+    Same records as get_streamed_matches(), in resolution order, so they can
+    be fed into the extractor while discovery is still running.
+    """
+    async with StreamedAPI(api_base, concurrency) as api:
+        matches = await api.live_matches()
+        print(f'Found {len(matches)} live matches')
+
+        # (source, id) -> every (match, source) listing it
+        listings = {}
+        for match in matches:
+            for source in match.get('sources') or []:
+                listings.setdefault((source['source'], source['id']), []).append((match, source))
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def resolve(key):
+            return key, await resolve_stream(api, semaphore, key[0], key[1])
+
+        tasks = [asyncio.ensure_future(resolve(key)) for key in listings]
+        try:
+            for next_resolved in asyncio.as_completed(tasks):
+                key, stream_data = await next_resolved
+                for match, source in listings[key]:
+                    entry = source_entry(match, source, stream_data)
+                    if entry:
+                        yield entry
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            print(api.summary())
+
+
+def source_key(source) -> str:
+    """Stable identity of a source across catalog snapshots"""
+    return f'{source["source"]}/{source["sourceId"]}'
+
+
+def load_snapshot(path: str = SNAPSHOT_PATH):
+    """Previous catalog snapshot: source key -> {'embedUrl', 'match', 'result', 'extractedAt'}"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_snapshot(snapshot, path: str = SNAPSHOT_PATH):
+    """Write the catalog snapshot for the next run"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def classify_source(previous, source) -> str:
+    """
+    Compare a discovered source with the previous snapshot
+
+    Returns:
+        str: 'added', 'changed' (new embed URL), 'unresolved' (same embed but
+        no usable result last time, its playlist URL has expired, or it has
+        no expiry and was extracted more than SNAPSHOT_MAX_AGE seconds ago)
+        or 'unchanged' (the previous result can be carried forward)
+    """
+    old = previous.get(source_key(source))
+    if not old:
+        return 'added'
+    if old['embedUrl'] != source['embedUrl']:
+        return 'changed'
+
+    result = old.get('result')
+    if not result:
+        return 'unresolved'
+    expiry = playlist_expiry(result['m3u8Url'])
+    if expiry is None:
+        # Entries from snapshots without timestamps count as too old
+        expiry = (old.get('extractedAt') or 0) + SNAPSHOT_MAX_AGE
+    if expiry <= time.time():
+        return 'unresolved'
+    return 'unchanged'
+
+
+async def extract_streams(pipeline: bool = PIPELINE, incremental: bool = INCREMENTAL):
+    """
+    Extract M3U8 streams from streamed.pk
+
+    Args:
+        pipeline: Feed each embed URL to the extractor as soon as its stream
+            data resolves, instead of discovering every source first
+        incremental: Diff the catalog against the previous run's snapshot,
+            extract only added/changed sources and carry the results of
+            unchanged ones forward
+    """
     print('=' * 70)
     print('Streamed.pk M3U8 Extraction Example (Python)\n')
     print('=' * 70)
     print('')
 
     try:
-        # Step 1: Get all sources from streamed.pk
-        sources = await get_streamed_matches()
-
-        if not sources:
-            print('No sources found. Exiting.')
-            return
-
-        # Step 2: Extract embed URLs
-        embed_urls = [s['embedUrl'] for s in sources]
+        start_time = time.time()
 
-        # Step 3: Initialize extractor with custom config
+        # Step 1: Initialize extractor with custom config
         extractor = M3U8Extractor({
             'concurrency': 10,       # Process 10 embeds at a time
             'timeout': 20000,        # 20 second timeout
@@ -82,18 +402,68 @@ async def extract_streams():
             'verbose': True          # Show progress
         })
 
-        print('Starting M3U8 extraction...\n')
+        previous = load_snapshot() if incremental else {}
+        delta = {'added': [], 'changed': [], 'unresolved': [], 'unchanged': [], 'removed': []}
+        # Source key -> source / diff status, and the first source seen for each embed URL
+        current = {}
+        statuses = {}
+        sources_by_url = {}
+
+        def needs_extraction(source) -> bool:
+            """Record a discovered source; True if its embed URL must be extracted"""
+            key = source_key(source)
+            if key in current:
+                return False
+            current[key] = source
+            status = statuses[key] = classify_source(previous, source)
+            delta[status].append(source)
+            if status == 'unchanged' or source['embedUrl'] in sources_by_url:
+                return False
+            sources_by_url[source['embedUrl']] = source
+            return True
+
+        if pipeline:
+            # Steps 2-4: Discovery feeds the extraction queue while it runs
+            async def embed_urls():
+                async for source in iter_streamed_sources():
+                    if needs_extraction(source):
+                        yield source['embedUrl']
+
+            print('Fetching live matches and extracting M3U8 URLs as sources resolve...\n')
+            results = []
+            async for result in extractor.extract_iter(embed_urls()):
+                results.append(result)
+                print(f'{"✅" if result["success"] else "❌"} {sources_by_url[result["embedUrl"]]["match"]}: '
+                      f'{result["m3u8Url"] or result["error"]}')
+        else:
+            # Step 2: Get all sources from streamed.pk
+            sources = await get_streamed_matches()
 
-        # Step 4: Extract M3U8 URLs
-        results = await extractor.extract(embed_urls)
+            # Step 3: Extract embed URLs of new and changed sources
+            embed_urls = [source['embedUrl'] for source in sources if needs_extraction(source)]
+
+            print(f'Starting M3U8 extraction of {len(embed_urls)} embeds...\n')
+
+            # Step 4: Extract M3U8 URLs
+            results = await extractor.extract(embed_urls)
 
         # Step 5: Close extractor
         await extractor.close()
 
+        if not current:
+            print('No sources found. Exiting.')
+            return
+
         # Step 6: Format and display results
+        delta['removed'] = [entry for key, entry in previous.items() if key not in current]
         print('\n' + '=' * 70)
         print('RESULTS:\n')
 
+        if incremental:
+            print(f'Catalog diff: {len(delta["added"])} added, {len(delta["changed"])} changed, '
+                  f'{len(delta["removed"])} removed, {len(delta["unresolved"])} retried, '
+                  f'{len(delta["unchanged"])} unchanged (carried forward)')
+
         successful = [r for r in results if r['success']]
         failed = [r for r in results if not r['success']]
 
@@ -107,7 +477,7 @@ async def extract_streams():
             print('-' * 70)
 
             for i, result in enumerate(successful[:10]):  # Show first 10
-                source = next(s for s in sources if s['embedUrl'] == result['embedUrl'])
+                source = sources_by_url[result['embedUrl']]
                 print(f'\n{i + 1}. {source["match"]}')
                 print(f'   Source: {source["source"]}/{source["sourceId"]}')
                 print(f'   M3U8: {result["m3u8Url"]}')
@@ -121,23 +491,46 @@ async def extract_streams():
         print('\n' + '=' * 70)
         print('STATISTICS:\n')
         print(f'Total Processed: {len(results)}')
-        print(f'Successful: {stats["successful"]} ({(stats["successful"] / len(results) * 100):.1f}%)')
-        print(f'Failed: {stats["failed"]} ({(stats["failed"] / len(results) * 100):.1f}%)')
+        if results:
+            print(f'Successful: {stats["successful"]} ({(stats["successful"] / len(results) * 100):.1f}%)')
+            print(f'Failed: {stats["failed"]} ({(stats["failed"] / len(results) * 100):.1f}%)')
         print(f'Average Time: {stats["average_time"] / 1000:.2f}s per extraction')
+        print(f'End-to-end Time: {time.time() - start_time:.2f}s ({"pipelined" if pipeline else "sequential"})')
         print('=' * 70)
 
+        # Format results; every source sharing an extracted embed URL gets it
+        results_by_url = {r['embedUrl']: r for r in successful}
+        snapshot = {}
+        formatted = []
+        for key, source in current.items():
+            result = results_by_url.get(source['embedUrl'])
+            extracted_at = start_time
+            if result:
+                entry = {
+                    'match': source['match'],
+                    'source': source['source'],
+                    'sourceId': source['sourceId'],
+                    'embedUrl': source['embedUrl'],
+                    'm3u8Url': result['m3u8Url'],
+                    'extractionTime': result['time']
+                }
+            elif statuses[key] == 'unchanged':
+                entry = {**previous[key]['result'], 'match': source['match']}
+                # Carried forward results keep aging from their original extraction
+                extracted_at = previous[key].get('extractedAt')
+            else:
+                entry = None
+
+            if entry:
+                formatted.append(entry)
+            snapshot[key] = {'embedUrl': source['embedUrl'], 'match': source['match'], 'result': entry,
+                             'extractedAt': extracted_at if entry else None}
+
+        if incremental:
+            save_snapshot(snapshot)
+
         # Return formatted results
-        return [
-            {
-                'match': next(s for s in sources if s['embedUrl'] == r['embedUrl'])['match'],
-                'source': next(s for s in sources if s['embedUrl'] == r['embedUrl'])['source'],
-                'sourceId': next(s for s in sources if s['embedUrl'] == r['embedUrl'])['sourceId'],
-                'embedUrl': r['embedUrl'],
-                'm3u8Url': r['m3u8Url'],
-                'extractionTime': r['time']
-            }
-            for r in successful
-        ]
+        return formatted
 
     except Exception as error:
         print(f'\n❌ Error: {error}')
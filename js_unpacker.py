@@ -0,0 +1,176 @@
+"""
+Packed JavaScript Unpacker
+
+Pure-Python deobfuscation for embed player scripts, so playlist URLs hidden
+in obfuscated JavaScript can be recovered without running a browser.
+
+Handles:
+- Dean Edwards' P.A.C.K.E.R. (eval(function(p,a,c,k,e,d){...})), including
+  nested packing and radixes up to 95
+- \\xNN and \\uNNNN string escapes
+- atob('...') base64 string literals
+- Split string concatenation ('https://' + 'host/...')
+
+Author: DaddyLive IPTV
+License: MIT
+"""
+
+import base64
+import binascii
+import re
+import string
+from typing import List
+
+PACKED_PATTERN = re.compile(r'eval\s*\(\s*function\s*\(\s*p\s*,\s*a\s*,\s*c\s*,\s*k\s*,\s*e\s*,\s*(?:r|d)\s*\)')
+
+# Arguments of the packer call: payload, radix, count, symbol table
+PACKED_ARGS_PATTERN = re.compile(
+    r"""\}\s*\(\s*(?P<q1>['"])(?P<payload>(?:\\.|(?!(?P=q1)).)*)(?P=q1)\s*,\s*(?P<radix>\d+|\[\])\s*,"""
+    r"""\s*(?P<count>\d+)\s*,\s*(?P<q2>['"])(?P<symtab>(?:\\.|(?!(?P=q2)).)*)(?P=q2)"""
+    r"""\s*\.split\(\s*(?P<q3>['"])\|(?P=q3)\s*\)""",
+    re.DOTALL
+)
+
+ALPHABET_62 = string.digits + string.ascii_lowercase + string.ascii_uppercase
+# The packer's "High ASCII" mode (radix 95) writes words as runs of \xa1-\xff
+ALPHABET_95 = ''.join(chr(code) for code in range(161, 256))
+
+MAX_DEPTH = 5
+
+
+def detect(source: str) -> bool:
+    """Check if source contains a P.A.C.K.E.R. payload"""
+    return PACKED_PATTERN.search(source) is not None
+
+
+def _unbaser(radix: int):
+    """Return a function decoding a word in the packer's base `radix`"""
+    if radix <= 36:
+        return lambda word: int(word, radix)
+
+    alphabet = ALPHABET_62 if radix <= 62 else ALPHABET_95
+    digits = {char: index for index, char in enumerate(alphabet[:radix])}
+
+    def unbase(word: str) -> int:
+        value = 0
+        for char in word:
+            value = value * radix + digits[char]
+        return value
+
+    return unbase
+
+
+def unpack(source: str) -> str:
+    """
+    Unpack the first P.A.C.K.E.R. payload in source
+
+    Args:
+        source: JavaScript containing eval(function(p,a,c,k,e,d){...}(...))
+
+    Returns:
+        str: The unpacked JavaScript
+
+    Raises:
+        ValueError: If no payload is found or it is malformed
+    """
+    start = PACKED_PATTERN.search(source)
+    if not start:
+        raise ValueError('No packed payload found')
+
+    match = PACKED_ARGS_PATTERN.search(source, start.end())
+    if not match:
+        raise ValueError('Packed payload arguments not recognised')
+
+    payload = match.group('payload').replace('\\\\', '\\').replace("\\'", "'").replace('\\"', '"')
+    radix = 62 if match.group('radix') == '[]' else int(match.group('radix'))
+    count = int(match.group('count'))
+    symtab = match.group('symtab').split('|')
+
+    if len(symtab) != count:
+        raise ValueError(f'Symbol table has {len(symtab)} entries, expected {count}')
+    if radix > 95:
+        raise ValueError(f'Unsupported radix {radix}')
+
+    unbase = _unbaser(radix)
+    word_pattern = r'[\xa1-\xff]+' if radix > 62 else r'\b\w+\b'
+
+    def lookup(word_match) -> str:
+        word = word_match.group(0)
+        try:
+            return symtab[unbase(word)] or word
+        except (KeyError, IndexError, ValueError):
+            return word
+
+    return re.sub(word_pattern, lookup, payload, flags=re.ASCII)
+
+
+def unpack_all(source: str) -> List[str]:
+    """
+    Unpack every packed payload in source, following nested packing
+
+    Args:
+        source: JavaScript or HTML
+
+    Returns:
+        list: Unpacked scripts, outermost first; empty if nothing is packed
+    """
+    unpacked = []
+    pending = [source]
+
+    for _ in range(MAX_DEPTH):
+        next_pending = []
+        for text in pending:
+            for start in PACKED_PATTERN.finditer(text):
+                try:
+                    script = unpack(text[start.start():])
+                except ValueError:
+                    continue
+                unpacked.append(script)
+                next_pending.append(script)
+        if not next_pending:
+            break
+        pending = next_pending
+
+    return unpacked
+
+
+def decode_escapes(source: str) -> str:
+    """Decode \\xNN and \\uNNNN escapes (slashes are commonly written as \\x2f)"""
+    source = re.sub(r'\\x([0-9a-fA-F]{2})', lambda m: chr(int(m.group(1), 16)), source)
+    return re.sub(r'\\u([0-9a-fA-F]{4})', lambda m: chr(int(m.group(1), 16)), source)
+
+
+def decode_base64_literals(source: str) -> List[str]:
+    """Decode the string literals passed to atob()"""
+    decoded = []
+    for match in re.finditer(r'atob\s*\(\s*[\'"]([A-Za-z0-9+/=\s]+)[\'"]\s*\)', source):
+        try:
+            decoded.append(base64.b64decode(match.group(1)).decode('utf-8', errors='replace'))
+        except (binascii.Error, ValueError):
+            continue
+    return decoded
+
+
+def join_concatenations(source: str) -> str:
+    """Merge adjacent string literals joined with +, e.g. 'https://' + 'cdn/'"""
+    return re.sub(r'([\'"])\s*\+\s*\1', '', source)
+
+
+def deobfuscate(source: str) -> str:
+    """
+    Apply every deobfuscation step and return the recovered source
+
+    The result contains the decoded original followed by every unpacked
+    script and decoded atob() literal, ready for URL scanning.
+
+    Args:
+        source: JavaScript or HTML
+
+    Returns:
+        str: Deobfuscated text
+    """
+    parts = [source] + unpack_all(source)
+    parts = [join_concatenations(decode_escapes(part)) for part in parts]
+    for part in list(parts):
+        parts.extend(decode_base64_literals(part))
+    return '\n'.join(parts)
@@ -9,6 +9,8 @@ Features:
 - Dynamic timeout (exits as soon as M3U8 found)
 - Automatic retry on failure
 - Memory efficient (reuses browser contexts)
+- Browserless fast path (static scan, JS unpacking, iframe chasing) with a
+  per-host router that learns which strategy works
 - Works with any embed site that loads M3U8 via network requests
 
 Author: DaddyLive IPTV
@@ -16,10 +18,944 @@ License: MIT
 """
 
 import asyncio
+import hashlib
+import html
+import json
+import multiprocessing
+import os
 import re
-from typing import List, Dict, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, List, Dict, Optional, Set, Tuple, Union
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+import js_unpacker
 import time
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+
+class ContextPool:
+    """
+    Exclusive checkout/check-in pool of browser contexts
+
+    Each context is handed to at most one caller at a time. Waiters are served
+    strictly first-come first-served: a released context is passed directly to
+    the oldest waiter instead of going back to the idle list, so a late caller
+    can never overtake one that is already queued.
+
+    With a `factory`, the pool grows on demand: when a caller has to wait and
+    fewer than `max_size` contexts exist, a new one is created for it in the
+    background.
+    """
+
+    def __init__(self, contexts: Optional[List[BrowserContext]] = None, limit: Optional[int] = None,
+                 factory: Optional[Callable[[], Awaitable[BrowserContext]]] = None,
+                 max_size: Optional[int] = None):
+        self._idle: deque = deque(contexts or [])
+        self._waiters: deque = deque()
+        self.size = len(self._idle)
+        self.limit = limit
+        self.factory = factory
+        self.max_size = max_size
+        self._growing = 0
+        self.reset_stats()
+
+    def add(self, context: BrowserContext):
+        """Add a new context to the pool"""
+        self.size += 1
+        self.release(context)
+
+    def clear(self):
+        """Forget all contexts, keeping statistics"""
+        self._idle.clear()
+        self.size = 0
+        self.max_size = None
+
+    @property
+    def in_use(self) -> int:
+        """Number of contexts currently checked out"""
+        return self.size - len(self._idle)
+
+    @property
+    def capacity(self) -> int:
+        """Number of contexts the pool can hold once fully grown"""
+        return max(self.size, self.max_size or 0)
+
+    def set_limit(self, limit: Optional[int]):
+        """
+        Cap the number of contexts that may be checked out at once
+
+        Lowering the limit never interrupts work in progress: busy contexts
+        simply stay idle after their release until usage drops below it.
+
+        Args:
+            limit: Maximum concurrent checkouts, or None for the pool size
+        """
+        self.limit = limit
+        self._dispatch()
+
+    def _has_capacity(self) -> bool:
+        return self.limit is None or self.in_use < self.limit
+
+    def _can_grow(self) -> bool:
+        return self.factory is not None and self.size < (self.max_size or 0)
+
+    def _dispatch(self):
+        """Hand idle contexts to waiters, growing the pool, while the limit allows it"""
+        while self._waiters and self._has_capacity():
+            if self._idle:
+                waiter = self._waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(self._idle.popleft())
+            elif self._can_grow() and self._growing < len(self._waiters):
+                # Reserve the slot now so concurrent dispatches don't overshoot
+                self.size += 1
+                self._growing += 1
+                asyncio.ensure_future(self._grow())
+            else:
+                break
+
+    async def _grow(self):
+        try:
+            context = await self.factory()
+        except Exception as error:
+            self.size -= 1
+            self._growing -= 1
+            # Fail one waiter with the factory's error rather than leaving it
+            # stranded when no other context will ever be released to it
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if not waiter.done():
+                    waiter.set_exception(error)
+                    break
+            self._dispatch()
+            return
+        self._growing -= 1
+        self.release(context)
+
+    async def acquire(self) -> BrowserContext:
+        """
+        Check out a context, waiting for one to be released if all are busy
+
+        Returns:
+            BrowserContext: Context reserved for exclusive use by the caller
+
+        Raises:
+            Exception: The factory's error if growing the pool for this
+                caller failed
+        """
+        start_time = time.time()
+
+        if self._idle and not self._waiters and self._has_capacity():
+            context = self._idle.popleft()
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self._dispatch()
+            try:
+                context = await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Context was handed over just as we were cancelled
+                    self.release(waiter.result())
+                elif waiter in self._waiters:
+                    # A release may already have dropped the cancelled waiter
+                    self._waiters.remove(waiter)
+                raise
+
+        wait = (time.time() - start_time) * 1000
+        self.stats['acquisitions'] += 1
+        self.stats['wait_time'] += wait
+        self.stats['max_wait'] = max(self.stats['max_wait'], wait)
+        self.stats['average_wait'] = self.stats['wait_time'] / self.stats['acquisitions']
+        return context
+
+    def release(self, context: BrowserContext):
+        """Check a context back in, handing it to the oldest waiter if any"""
+        self._idle.append(context)
+        self._dispatch()
+
+    def discard(self):
+        """Forget a checked-out context that will not be released again"""
+        self.size -= 1
+        self._dispatch()
+
+    def take_idle(self) -> List[BrowserContext]:
+        """Check out every idle context at once, e.g. to replace them"""
+        contexts = list(self._idle)
+        self._idle.clear()
+        return contexts
+
+    @asynccontextmanager
+    async def checkout(self):
+        """Async context manager wrapping acquire()/release()"""
+        context = await self.acquire()
+        try:
+            yield context
+        finally:
+            self.release(context)
+
+    def reset_stats(self):
+        """Reset wait-time statistics"""
+        self.stats = {
+            'acquisitions': 0,
+            'wait_time': 0,
+            'max_wait': 0,
+            'average_wait': 0
+        }
+
+
+def _cpu_pressure() -> Optional[float]:
+    """1-minute load average per core, or None where unavailable"""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+
+def _memory_pressure() -> Optional[float]:
+    """Fraction of physical memory in use (Linux only), or None"""
+    try:
+        meminfo = {}
+        with open('/proc/meminfo') as f:
+            for line in f:
+                key, value = line.split(':', 1)
+                meminfo[key] = int(value.split()[0])
+        return 1 - meminfo['MemAvailable'] / meminfo['MemTotal']
+    except (OSError, KeyError, ValueError, ZeroDivisionError):
+        return None
+
+
+def _process_tree_rss() -> Optional[float]:
+    """
+    Resident memory (MB) of this process and all of its descendants, which
+    covers the Playwright driver and every Chromium process (Linux only)
+
+    Returns:
+        float: RSS in MB, or None where /proc is unavailable
+    """
+    try:
+        parents = {}
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    # comm may contain spaces, so split after its closing paren
+                    fields = f.read().rsplit(')', 1)[1].split()
+                parents[int(entry)] = int(fields[1])
+            except (OSError, IndexError, ValueError):
+                continue
+
+        tree = {os.getpid()}
+        added = True
+        while added:
+            children = {pid for pid, ppid in parents.items() if ppid in tree and pid not in tree}
+            tree |= children
+            added = bool(children)
+
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        total = 0
+        for pid in tree:
+            try:
+                with open(f'/proc/{pid}/statm') as f:
+                    total += int(f.read().split()[1]) * page_size
+            except (OSError, IndexError, ValueError):
+                continue
+        return total / (1024 * 1024)
+    except (OSError, AttributeError, ValueError):
+        return None
+
+
+# Regex metacharacters that end a literal run, and quantifiers that make the
+# preceding character optional
+_REGEX_BREAKS = set('.^$')
+_REGEX_OPTIONAL = set('?*{')
+_REGEX_REPEAT = re.compile(r'\{\d*(?:,\d*)?\}')
+
+
+def _required_literal(pattern: str) -> Optional[str]:
+    """
+    Longest literal substring every match of a simple regex must contain
+
+    Conservative: returns None for patterns with alternation, groups or
+    character classes, where no single required literal is easy to prove.
+    """
+    runs = ['']
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char in '|([':
+            return None
+        if char == '\\' and i + 1 < len(pattern):
+            escaped = pattern[i + 1]
+            i += 2
+            if escaped in 'xuUN0123456789':
+                # Code point escapes and backreferences
+                return None
+            if escaped.isalnum():
+                # Character class (\d, \w, ...) or anchor (\b, \A, ...)
+                runs.append('')
+                continue
+            literal = escaped
+        elif char in _REGEX_BREAKS or char in _REGEX_OPTIONAL or char in '+)]}':
+            i += 1
+            if char == '{':
+                # Skip the bounds of a {m,n} repeat; a brace that is not one is
+                # matched literally by re, which is not worth modelling here
+                repeat = _REGEX_REPEAT.match(pattern, i - 1)
+                if not repeat:
+                    return None
+                i = repeat.end()
+            if char in _REGEX_OPTIONAL and runs[-1]:
+                runs[-1] = runs[-1][:-1]
+            runs.append('')
+            continue
+        else:
+            literal = char
+            i += 1
+
+        # A quantifier on this character makes it optional or repeatable
+        if i < len(pattern) and pattern[i] in _REGEX_OPTIONAL:
+            runs.append('')
+            continue
+        runs[-1] += literal
+        if i < len(pattern) and pattern[i] == '+':
+            runs.append('')
+
+    longest = max(runs, key=len)
+    return longest.lower() or None
+
+
+class URLMatcher:
+    """
+    Case-insensitive "does any pattern match this URL" test, built once
+
+    Checking every network event against each pattern with re.search() is
+    wasted work for the images, scripts and XHRs that make up most traffic.
+    The matcher first looks for a literal every pattern requires (e.g.
+    '.m3u8') in the lowercased URL, and only then runs a single compiled
+    alternation of all patterns. If any pattern has no provable literal the
+    prefilter is skipped.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+        literals = [_required_literal(pattern) for pattern in self.patterns]
+        if literals and all(literals):
+            # '.m3u8' already covers 'index.m3u8'
+            self.prefilter: Optional[Tuple[str, ...]] = tuple(sorted(
+                {literal for literal in literals
+                 if not any(other != literal and other in literal for other in literals)}
+            ))
+        else:
+            self.prefilter = None
+
+        self.regex = None
+        self.regexes = None
+        # Numbered backreferences would point at the wrong group once joined
+        if not any(re.search(r'\\[1-9]', pattern) for pattern in self.patterns):
+            try:
+                self.regex = re.compile('|'.join(f'(?:{pattern})' for pattern in self.patterns), re.IGNORECASE)
+            except re.error:
+                pass
+        if self.regex is None:
+            self.regexes = [re.compile(pattern, re.IGNORECASE) for pattern in self.patterns]
+
+    def search(self, url: str) -> bool:
+        """Whether any pattern matches the URL"""
+        if not self.patterns:
+            return False
+        if self.prefilter is not None:
+            lowered = url.lower()
+            if not any(literal in lowered for literal in self.prefilter):
+                return False
+        if self.regex is not None:
+            return self.regex.search(url) is not None
+        return any(regex.search(url) for regex in self.regexes)
+
+
+# Where playlist URLs show up in static embed HTML and player scripts
+STATIC_PLAYLIST_PATTERNS = [
+    re.compile(r'<source[^>]+src\s*=\s*["\']([^"\']+\.m3u8[^"\']*)["\']', re.IGNORECASE),
+    re.compile(r'["\']?(?:file|src|source|hls|url)["\']?\s*[:=]\s*["\']([^"\']+\.m3u8[^"\']*)["\']', re.IGNORECASE),
+    re.compile(r'(https?:(?:\\?/){2}[^\s"\'<>]+?\.m3u8[^\s"\'<>]*)', re.IGNORECASE)
+]
+
+SCRIPT_SRC_PATTERN = re.compile(r'<script[^>]+src\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+IFRAME_SRC_PATTERN = re.compile(r'<iframe[^>]+src\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+
+def scan_for_playlists(text: str, base_url: str) -> List[str]:
+    """
+    Find playlist URLs written directly into HTML or JavaScript source
+
+    Args:
+        text: HTML or script source
+        base_url: URL the text was loaded from, to resolve relative URLs
+
+    Returns:
+        list: Absolute playlist URLs in order of appearance, without duplicates
+    """
+    found = []
+    for pattern in STATIC_PLAYLIST_PATTERNS:
+        for match in pattern.finditer(text):
+            url = html.unescape(match.group(1)).replace('\\/', '/')
+            url = urljoin(base_url, url)
+            if url.startswith(('http://', 'https://')) and url not in found:
+                found.append(url)
+    return found
+
+
+def scan_unpacked(text: str, base_url: str) -> List[str]:
+    """Like scan_for_playlists(), after unpacking and deobfuscating the source"""
+    return scan_for_playlists(js_unpacker.deobfuscate(text), base_url)
+
+
+# Browserless extraction strategies, name -> scanner(text, base_url). Tried
+# in the order given by config['static_strategies']. 'iframe' is not a
+# scanner: it re-runs these scanners on the documents of embedded iframes
+STATIC_STRATEGIES: Dict[str, Callable[[str, str], List[str]]] = {
+    'static': scan_for_playlists,
+    'unpack': scan_unpacked
+}
+
+
+# Candidate playlist scoring. A scorer takes (candidate, config) and returns
+# points; a candidate's score is the sum over config['candidate_scorers'].
+# Candidates are dicts with 'url' and 'type' ('master', 'media' or None if
+# the playlist body was not seen)
+MEDIA_PLAYLIST_HINTS = re.compile(r'chunklist|variant|media_|/(?:\d{3,4}p|\d+k)/|_(?:\d{3,4}p|\d+k)[._/]',
+                                  re.IGNORECASE)
+MASTER_PLAYLIST_HINTS = re.compile(r'master|playlist\.m3u8|index\.m3u8', re.IGNORECASE)
+RESOLUTION_HINT = re.compile(r'(?<!\d)(\d{3,4})p(?![a-z])', re.IGNORECASE)
+# Ad words only count as whole tokens (path segments, or 'ad' between separators),
+# so e.g. /devastation-live/ or /commercial-channel/ are not penalised
+AD_PATH_HINTS = re.compile(
+    r'/ads?/|[/_-]ads?[/_.-]|/(?:pre-?roll|adverts?|advertisements?|vast|commercials?)(?=[/.]|$)',
+    re.IGNORECASE
+)
+DEFAULT_AD_HOSTS = ['doubleclick.net', 'googlesyndication.com', 'imasdk.googleapis.com', 'adnxs.com',
+                    'springserve.com', 'spotxchange.com', 'aniview.com', 'vidoomy.com', 'adsrvr.org']
+
+
+def _host_matches(host: str, suffix: str) -> bool:
+    return host == suffix or host.endswith('.' + suffix)
+
+
+def guess_playlist_type(url: str) -> Optional[str]:
+    """'master' or 'media' from URL naming conventions, None if unclear"""
+    if MEDIA_PLAYLIST_HINTS.search(url):
+        return 'media'
+    if MASTER_PLAYLIST_HINTS.search(url):
+        return 'master'
+    return None
+
+
+def score_playlist_type(candidate: Dict, config: Dict) -> float:
+    """Prefer master playlists (all renditions) over single media playlists"""
+    kind = candidate.get('type') or guess_playlist_type(candidate['url'])
+    return {'master': 3, 'media': 0}.get(kind, 1)
+
+
+def score_path_hints(candidate: Dict, config: Dict) -> float:
+    """Reward conventional playlist names, and higher resolutions among variants"""
+    path = urlsplit(candidate['url']).path.lower()
+    score = 1 if path.endswith(('/playlist.m3u8', '/index.m3u8', '/master.m3u8')) else 0
+    resolution = RESOLUTION_HINT.search(path)
+    if resolution:
+        score += min(int(resolution.group(1)), 1080) / 1080
+    return score
+
+
+def score_ad_hosts(candidate: Dict, config: Dict) -> float:
+    """Sink pre-roll and ad playlists"""
+    parts = urlsplit(candidate['url'])
+    host = (parts.hostname or '').lower()
+    if any(_host_matches(host, ad_host) for ad_host in config['candidate_ad_hosts']):
+        return -100
+    return -100 if AD_PATH_HINTS.search(parts.path) else 0
+
+
+def score_host_reputation(candidate: Dict, config: Dict) -> float:
+    """Configured per-host points (config['candidate_host_scores'], by domain suffix)"""
+    host = (urlsplit(candidate['url']).hostname or '').lower()
+    return sum(points for suffix, points in config['candidate_host_scores'].items()
+               if _host_matches(host, suffix.lower()))
+
+
+CANDIDATE_SCORERS: Dict[str, Callable[[Dict, Dict], float]] = {
+    'playlist_type': score_playlist_type,
+    'path_hints': score_path_hints,
+    'ad_hosts': score_ad_hosts,
+    'host_reputation': score_host_reputation
+}
+
+
+class ConcurrencyController:
+    """
+    AIMD (additive increase, multiplicative decrease) controller for the
+    number of contexts a ContextPool may hand out
+
+    Every `adaptive_window` extractions the controller looks at the observed
+    latency and failure rate plus host CPU/memory pressure. If everything is
+    healthy the target grows by one context, otherwise it is multiplied by
+    `adaptive_decrease`. The target always stays within
+    [min_concurrency, max_concurrency].
+    """
+
+    def __init__(self, pool: ContextPool, config: Dict):
+        self.pool = pool
+        self.config = config
+        self.floor = max(1, config['min_concurrency'])
+        self.ceiling = max(self.floor, config['max_concurrency'] or config['concurrency'] * 2)
+        self.target = min(max(config['concurrency'], self.floor), self.ceiling)
+        self.samples: List[Dict] = []
+        self.pool.set_limit(self.target)
+
+    def record(self, result: Dict):
+        """Record a finished extraction and adjust the target when a window fills up"""
+        self.samples.append(result)
+        if len(self.samples) >= self.config['adaptive_window']:
+            self.adjust()
+
+    def overloaded(self) -> bool:
+        """Whether the last window shows latency, failure or host pressure"""
+        failure_rate = sum(1 for r in self.samples if not r['success']) / len(self.samples)
+        latency = sum(r['time'] for r in self.samples) / len(self.samples)
+        cpu = _cpu_pressure()
+        memory = _memory_pressure()
+
+        return (
+            failure_rate > self.config['adaptive_failure_threshold']
+            or latency > self.config['adaptive_latency_target']
+            or (cpu is not None and cpu > self.config['adaptive_cpu_threshold'])
+            or (memory is not None and memory > self.config['adaptive_memory_threshold'])
+        )
+
+    def adjust(self):
+        """Apply one AIMD step based on the current window"""
+        if self.overloaded():
+            self.target = max(self.floor, int(self.target * self.config['adaptive_decrease']))
+        else:
+            self.target = min(self.ceiling, self.target + 1)
+
+        self.samples = []
+        self.pool.set_limit(self.target)
+
+
+class StrategyRouter:
+    """
+    Learns which extraction strategy works for each embed host
+
+    For every host and strategy ('static', 'unpack', 'iframe' or 'browser') the
+    router counts attempts, successes and the time successful attempts took.
+    plan() then sends a host's URLs to the cheapest strategy that historically
+    works, skipping the static attempt entirely for hosts that only ever work
+    in the browser. Unknown hosts get the full static chain, and every
+    `explore_every`-th URL of a host does too, so cheaper strategies that start
+    working are picked up again. The caller always escalates to the browser
+    when the planned strategies miss.
+
+    The history can be persisted as JSON between runs: it is read from
+    `path` on first use and written by save().
+    """
+
+    def __init__(self, strategies: List[str], path: Optional[str] = None, min_success: float = 0.5,
+                 min_attempts: int = 3, explore_every: int = 20):
+        """
+        Args:
+            strategies: Full static strategy chain, cheapest first
+            path: JSON file the history is loaded from and saved to, or None
+            min_success: Success rate a strategy needs to count as working
+            min_attempts: Failed attempts per static strategy before a host
+                with no working strategy goes straight to the browser
+            explore_every: Plan the full static chain every Nth URL of a host
+        """
+        self.strategies = list(strategies)
+        self.path = path
+        self.min_success = min_success
+        self.min_attempts = min_attempts
+        self.explore_every = explore_every
+        # host -> strategy -> {'attempts', 'successes', 'time'}
+        self.hosts: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self.plans: Dict[str, int] = {}
+        self.loaded = False
+
+    def load(self):
+        """Load the history from `path`, ignoring a missing or unreadable file"""
+        self.loaded = True
+        if not self.path:
+            return
+        try:
+            with open(self.path) as f:
+                hosts = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(hosts, dict):
+            self.hosts = hosts
+
+    def save(self):
+        """Write the history to `path` (atomically, last writer wins)"""
+        # Never used this run: writing would replace the file with an empty history
+        if not self.path or not self.loaded:
+            return
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.hosts, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def record(self, host: str, strategy: str, success: bool, elapsed: float = 0):
+        """Record the outcome of one strategy attempt for a host"""
+        if not self.loaded:
+            self.load()
+        entry = self.hosts.setdefault(host, {}).setdefault(
+            strategy, {'attempts': 0, 'successes': 0, 'time': 0}
+        )
+        entry['attempts'] += 1
+        if success:
+            entry['successes'] += 1
+            entry['time'] += elapsed
+
+    def best(self, host: str) -> Optional[str]:
+        """Cheapest strategy (by average success time) that works for a host"""
+        if not self.loaded:
+            self.load()
+        working = {
+            name: entry['time'] / entry['successes']
+            for name, entry in self.hosts.get(host, {}).items()
+            if entry['successes'] and entry['successes'] / entry['attempts'] >= self.min_success
+            and (name == 'browser' or name in self.strategies)
+        }
+        return min(working, key=working.get) if working else None
+
+    def plan(self, host: str) -> List[str]:
+        """
+        Static strategies to try for a host before the browser
+
+        Returns:
+            list: Strategy names in order; empty to go straight to the browser
+        """
+        if not self.loaded:
+            self.load()
+        self.plans[host] = self.plans.get(host, 0) + 1
+        history = self.hosts.get(host)
+        if not history or self.plans[host] % self.explore_every == 0:
+            return list(self.strategies)
+
+        best = self.best(host)
+        if best == 'browser':
+            return []
+        if best:
+            return [best]
+
+        exhausted = all(history.get(name, {}).get('attempts', 0) >= self.min_attempts
+                        for name in self.strategies)
+        return [] if exhausted else list(self.strategies)
+
+
+class AssetCache:
+    """
+    Size-bounded on-disk LRU cache for static assets shared by all contexts
+
+    Each entry is a pair of files named after the SHA-1 of the URL: the body
+    and a small JSON header file (status, response headers and the time the
+    entry stops being fresh, see asset_freshness()). File mtimes are the LRU
+    clock, so the order survives restarts: a hit touches the entry and
+    storing evicts the least recently used entries until the cache fits in
+    `max_bytes` again.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # key -> body size, least recently used first
+        self.entries: 'OrderedDict[str, int]' = OrderedDict()
+        self.size = 0
+        self.evictions = 0
+
+    def load(self):
+        """Create the cache directory and index existing entries by mtime"""
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.body'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            found.append((stat.st_mtime, name[:-len('.body')], stat.st_size))
+
+        self.entries = OrderedDict((key, size) for _, key, size in sorted(found))
+        self.size = sum(self.entries.values())
+        self._evict()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, f'{key}.{suffix}')
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def get(self, url: str) -> Optional[Tuple[int, Dict[str, str], bytes, float]]:
+        """
+        Look up a URL, marking the entry as recently used
+
+        Returns:
+            tuple: (status, headers, body, expires), or None on a miss. The
+            entry may be stale (expires in the past) and need revalidation.
+        """
+        key = self.key(url)
+        if key not in self.entries:
+            return None
+        try:
+            with open(self._path(key, 'json')) as f:
+                meta = json.load(f)
+            with open(self._path(key, 'body'), 'rb') as f:
+                body = f.read()
+            os.utime(self._path(key, 'body'))
+        except (OSError, ValueError):
+            self._remove(key)
+            return None
+
+        self.entries.move_to_end(key)
+        # Entries written before expiries were stored are treated as stale
+        return meta['status'], meta['headers'], body, meta.get('expires', 0)
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes, expires: float):
+        """Store a response fresh until `expires` (epoch), evicting older entries to stay within max_bytes"""
+        if len(body) > self.max_bytes:
+            return
+        key = self.key(url)
+        if key in self.entries:
+            self._remove(key)
+
+        # Write to temporary names first so readers never see half an entry
+        suffix = f'{os.getpid()}.tmp'
+        with open(self._path(key, f'json.{suffix}'), 'w') as f:
+            json.dump({'url': url, 'status': status, 'headers': headers, 'expires': expires}, f)
+        with open(self._path(key, f'body.{suffix}'), 'wb') as f:
+            f.write(body)
+        os.replace(self._path(key, f'json.{suffix}'), self._path(key, 'json'))
+        os.replace(self._path(key, f'body.{suffix}'), self._path(key, 'body'))
+
+        self.entries[key] = len(body)
+        self.size += len(body)
+        self._evict()
+
+    def refresh(self, url: str, expires: float):
+        """Extend the freshness of an entry after a successful revalidation"""
+        key = self.key(url)
+        if key not in self.entries:
+            return
+        path = self._path(key, 'json')
+        try:
+            with open(path) as f:
+                meta = json.load(f)
+            meta['expires'] = expires
+            with open(f'{path}.{os.getpid()}.tmp', 'w') as f:
+                json.dump(meta, f)
+            os.replace(f'{path}.{os.getpid()}.tmp', path)
+        except (OSError, ValueError):
+            self._remove(key)
+
+    def _remove(self, key: str):
+        self.size -= self.entries.pop(key, 0)
+        for suffix in ('body', 'json'):
+            try:
+                os.remove(self._path(key, suffix))
+            except OSError:
+                pass
+
+    def _evict(self):
+        while self.size > self.max_bytes and self.entries:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+
+# Hop-by-hop and encoding headers that no longer describe a cached body
+_UNCACHED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection',
+                     'set-cookie', 'date', 'age'}
+
+# Lifetime given to `immutable` responses that carry no other expiry
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def asset_freshness(headers: Dict[str, str], default: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds a response stays fresh, from Cache-Control max-age or
+    immutable, or else Expires
+
+    Responses without an expiry get `default`. Without one they are only
+    worth storing when they can be revalidated (ETag or Last-Modified) and
+    are then fresh for 0 seconds.
+
+    Args:
+        headers: Response headers
+        default: Lifetime for responses that do not give one, or None
+
+    Returns:
+        float: Freshness lifetime in seconds, or None if the response must not
+        be stored (no-store, private, Vary on anything but Accept-Encoding, or
+        neither an expiry, a default nor a validator)
+    """
+    headers = {name.lower(): value for name, value in headers.items()}
+    directives = {}
+    for directive in headers.get('cache-control', '').lower().split(','):
+        name, _, value = directive.strip().partition('=')
+        directives[name] = value.strip('"')
+
+    if 'no-store' in directives or 'private' in directives:
+        return None
+    # The cache is keyed by URL alone; the browser handles Accept-Encoding itself
+    vary = {name.strip().lower() for name in headers.get('vary', '').split(',') if name.strip()}
+    if vary - {'accept-encoding'}:
+        return None
+
+    validated = 'etag' in headers or 'last-modified' in headers
+    if 'no-cache' in directives:
+        return 0 if validated else None
+    try:
+        age = float(headers.get('age', 0))
+    except ValueError:
+        age = 0
+    try:
+        return max(0.0, float(directives['max-age']) - age)
+    except (KeyError, ValueError):
+        pass
+    if 'immutable' in directives:
+        return IMMUTABLE_MAX_AGE
+
+    if 'expires' in headers:
+        try:
+            expires = parsedate_to_datetime(headers['expires']).timestamp()
+            date = (parsedate_to_datetime(headers['date']).timestamp()
+                    if 'date' in headers else time.time())
+        except (TypeError, ValueError):
+            # An invalid Expires means already expired
+            return 0 if validated else None
+        return max(0.0, expires - date - age)
+    if default is not None:
+        return default
+    return 0 if validated else None
+
+
+# Query parameters CDNs use for the expiry time (epoch) of signed playlist URLs
+EXPIRY_PARAMS = ('expires', 'expiry', 'expire', 'exp', 'e')
+
+
+def normalize_embed_url(url: str) -> str:
+    """Canonical form of an embed URL: lowercase scheme/host, sorted query, no fragment"""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+
+def playlist_expiry(m3u8_url: str) -> Optional[float]:
+    """
+    Expiry timestamp (epoch seconds) encoded in a signed playlist URL
+
+    Returns:
+        float: Expiry time, or None if the URL has no recognisable expiry
+    """
+    params = {key.lower(): value for key, value in parse_qsl(urlsplit(m3u8_url).query)}
+    for name in EXPIRY_PARAMS:
+        try:
+            value = float(params[name])
+        except (KeyError, ValueError):
+            continue
+        # Milliseconds
+        if value > 1e12:
+            value /= 1000
+        # Anything smaller is not an epoch timestamp (e.g. e=1 flags)
+        if value > 1e9:
+            return value
+    return None
+
+
+class ResultCache:
+    """
+    Persistent embed URL -> successful result cache with per-entry expiry
+
+    Entries are keyed by normalize_embed_url() and stored in a JSON file.
+    Once `max_entries` is reached the least recently used entries are
+    evicted. The file is read on first use and written by save().
+    """
+
+    def __init__(self, path: Optional[str], max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        # key -> {'result': dict, 'expires': epoch seconds}, least recently used first
+        self.entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self.loaded = False
+
+    def load(self):
+        """Read the cache file, ignoring a missing or unreadable one"""
+        self.loaded = True
+        if not self.path:
+            return
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(entries, dict):
+            self.entries = OrderedDict(entries)
+
+    def save(self):
+        """Write the cache file (atomically, last writer wins)"""
+        if not self.path or not self.loaded:
+            return
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, embed_url: str) -> Tuple[Optional[Dict], bool]:
+        """
+        Look up an embed URL
+
+        Returns:
+            tuple: (result, expired) - the cached result or None, and whether
+            an entry was found but had expired (it is dropped)
+        """
+        if not self.loaded:
+            self.load()
+        key = normalize_embed_url(embed_url)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None, False
+        if entry['expires'] <= time.time():
+            del self.entries[key]
+            return None, True
+
+        self.entries.move_to_end(key)
+        return entry['result'], False
+
+    def put(self, embed_url: str, result: Dict, expires: float) -> int:
+        """
+        Store a result until `expires`
+
+        Returns:
+            int: Number of entries evicted to make room
+        """
+        if not self.loaded:
+            self.load()
+        key = normalize_embed_url(embed_url)
+        self.entries.pop(key, None)
+        self.entries[key] = {'result': result, 'expires': expires}
+
+        evicted = 0
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            evicted += 1
+        return evicted
 
 
 class M3U8Extractor:
@@ -34,41 +970,314 @@ class M3U8Extractor:
         Args:
             config: Configuration dictionary with options:
                 - timeout (int): Max time to wait for M3U8 (ms), default 20000
+                - wait_until (str): Navigation milestone for page.goto(): 'commit',
+                  'domcontentloaded', 'load' or 'networkidle', default
+                  'domcontentloaded'. Detection keeps running after it is reached
+                - navigation_timeout (int): Timeout for page.goto() (ms), default
+                  `timeout`
+                - detection_timeout (int): Total time budget for the playlist to
+                  appear, counted from the start of the extraction (ms), default
+                  `timeout`
                 - concurrency (int): Number of concurrent browser contexts, default 10
                 - retries (int): Number of retries for failed extractions, default 1
+                - retry_backoff (int): Delay before the first retry (ms), default 1000
+                - retry_backoff_factor (float): Delay multiplier per further retry, default 2
+                - retry_backoff_max (int): Upper bound for the retry delay (ms), default 10000
+                - retry_budget (int): Max retries per run across all URLs, default None
+                  (only `retries` per URL applies)
+                - retry_fresh_context (bool): Run retries in a throwaway context
+                  instead of a pooled one, default False
+                - reuse_pages (bool): Keep one warm page per context and reset it
+                  between extractions instead of new_page()/close(), default False
+                - page_max_uses (int): Extractions before a warm page is replaced,
+                  default 50
+                - clear_storage (bool): Clear cookies and the embed origin's storage
+                  when resetting a warm page, default False
+                - context_max_uses (int): Replace a context after this many
+                  extractions, default None (never)
+                - browser_max_uses (int): Relaunch the browser after this many
+                  extractions, default None (never)
+                - browser_max_rss (int): Relaunch the browser once the process tree
+                  (driver + Chromium) exceeds this RSS in MB, default None
+                - rss_check_interval (int): Extractions between RSS checks, default 10
+                - crash_requeues (int): Times a URL is requeued after its page or
+                  browser crashed, on top of `retries`, default 2
+                - lazy_init (bool): Start with a single context and grow the pool
+                  on demand up to its size, default False (all contexts are
+                  created up front, in parallel)
+                - block_resource_types (list): Playwright resource types to abort
+                  before they hit the network, e.g. ['image', 'font', 'stylesheet'],
+                  default [] (no request interception)
+                - block_url_patterns (list): Regex patterns of request URLs to abort
+                  (ads, analytics, ...), default []
+                - block_segments (str): Abort HLS segment, key and sub-playlist
+                  fetches: 'after_match' once a playlist was found, 'always' for
+                  segments and keys from the start, default None (off). With a
+                  candidate_window the playlist is only settled when the window
+                  closes, so 'after_match' then blocks nothing
+                - segment_extensions (list): URL path suffixes treated as segments
+                  or keys, default ['.ts', '.m4s', '.aac', '.m4a', '.key']
+                - segment_size_estimate (int): Bytes assumed per blocked segment
+                  for the segment_bytes_saved stat until real sizes are known;
+                  the average Content-Length of segments that were let through
+                  is used once any have been seen, default 1000000
+                - asset_cache_dir (str): Directory of a shared on-disk cache that
+                  serves static assets (player bundles, styles, fonts) to every
+                  context through request routing, honouring their Cache-Control
+                  / Expires lifetimes and revalidating stale entries, default
+                  None (off)
+                - asset_cache_max_bytes (int): Size bound of the asset cache, least
+                  recently used entries are evicted, default 200000000
+                - asset_cache_types (list): Resource types eligible for caching,
+                  default ['script', 'stylesheet', 'font']
+                - result_cache (bool): Reuse playlist URLs found by earlier runs
+                  until they expire; extract() returns hits without touching
+                  the browser, default False
+                - result_cache_path (str): JSON file the result cache persists
+                  to, default None (in memory, for this extractor only)
+                - result_cache_ttl (int): Lifetime (s) of a cached result when the
+                  playlist URL carries no expiry/e=/expires= parameter, default 300
+                - result_cache_margin (int): Seconds taken off an expiry found in
+                  the playlist URL, so it is not handed out about to die,
+                  default 30
+                - result_cache_max_entries (int): Least recently used entries
+                  beyond this are evicted, default 10000
+                - fast_path (bool): Try a plain HTTP GET of the embed first and scan
+                  its HTML and linked scripts for playlist URLs; Chromium is only
+                  used on a miss. Requires aiohttp, default False
+                - static_strategies (list): Browserless strategies the fast path
+                  tries, in order: 'static' (plain scan), 'unpack' (P.A.C.K.E.R.
+                  and string deobfuscation, see js_unpacker) and 'iframe' (scan
+                  embedded iframe documents), default all three
+                - fast_path_iframes (int): Max iframes followed per embed, default 3
+                - router_path (str): JSON file where the per-host strategy
+                  router keeps what worked between runs, default None (learn
+                  in memory only). The router only acts with fast_path on
+                - router_min_success (float): Success rate a strategy needs
+                  before the router prefers it for a host, default 0.5
+                - router_explore_every (int): Retry the full static chain every
+                  Nth URL of a host to re-learn, default 20
+                - fast_path_timeout (int): Total time budget for the static
+                  attempt (ms), default 5000
+                - fast_path_scripts (int): Max linked scripts fetched per embed,
+                  default 5
+                - http_connections (int): Connection pool size of the shared HTTP
+                  session, default 20
+                - detection_mode (str): 'request' to detect playlists as soon as
+                  they are requested anywhere in the context (pages, iframes,
+                  workers), or 'response' to wait for the playlist response as
+                  stricter confirmation, default 'request'
+                - candidate_window (int): Grace period (ms) after the first
+                  acceptable playlist during which further candidates (master vs
+                  variants, ads vs content) are collected before picking the
+                  best; 0 resolves on the first acceptable one, default 0.
+                  Segments are not blocked during the window (see block_segments)
+                - candidate_scorers (list): Scorer names from CANDIDATE_SCORERS or
+                  callables (candidate, config) -> points, default all of
+                  'playlist_type', 'path_hints', 'ad_hosts', 'host_reputation'
+                - candidate_min_score (float): Candidates scoring below this are
+                  never picked (ad hosts score -100), default -50
+                - candidate_ad_hosts (list): Domains whose playlists are ads,
+                  default DEFAULT_AD_HOSTS
+                - candidate_host_scores (dict): Domain suffix -> points for known
+                  good (positive) or bad (negative) playlist hosts, default {}
                 - verbose (bool): Enable logging, default False
                 - m3u8_patterns (list): Regex patterns to match M3U8 URLs
                 - headless (bool): Run browser in headless mode, default True
+                - adaptive (bool): Adjust the number of busy contexts with an AIMD
+                  controller, default False. `concurrency` is the starting target
+                - min_concurrency (int): Adaptive floor, default 1
+                - max_concurrency (int): Adaptive ceiling, default 2 x concurrency
+                - adaptive_window (int): Extractions per adjustment step, default 10
+                - adaptive_latency_target (int): Average extraction time (ms) above
+                  which concurrency is reduced, default 10000
+                - adaptive_failure_threshold (float): Failure rate above which
+                  concurrency is reduced, default 0.5
+                - adaptive_cpu_threshold (float): Load average per core above which
+                  concurrency is reduced, default 0.9
+                - adaptive_memory_threshold (float): Fraction of memory in use above
+                  which concurrency is reduced, default 0.9
+                - adaptive_decrease (float): Multiplicative decrease factor, default 0.5
+                - processes (int): Worker processes used by ShardedExtractor and
+                  extract_m3u8(), each with its own browser, default 1
         """
         default_config = {
             'timeout': 20000,
+            'wait_until': 'domcontentloaded',
+            'navigation_timeout': None,
+            'detection_timeout': None,
             'concurrency': 10,
             'retries': 1,
+            'retry_backoff': 1000,
+            'retry_backoff_factor': 2,
+            'retry_backoff_max': 10000,
+            'retry_budget': None,
+            'retry_fresh_context': False,
+            'reuse_pages': False,
+            'page_max_uses': 50,
+            'clear_storage': False,
+            'context_max_uses': None,
+            'browser_max_uses': None,
+            'browser_max_rss': None,
+            'rss_check_interval': 10,
+            'crash_requeues': 2,
+            'lazy_init': False,
+            'block_resource_types': [],
+            'block_url_patterns': [],
+            'block_segments': None,
+            'segment_extensions': ['.ts', '.m4s', '.aac', '.m4a', '.key'],
+            'segment_size_estimate': 1000000,
+            'asset_cache_dir': None,
+            'asset_cache_max_bytes': 200000000,
+            'asset_cache_types': ['script', 'stylesheet', 'font'],
+            'result_cache': False,
+            'result_cache_path': None,
+            'result_cache_ttl': 300,
+            'result_cache_margin': 30,
+            'result_cache_max_entries': 10000,
+            'fast_path': False,
+            'static_strategies': ['static', 'unpack', 'iframe'],
+            'fast_path_iframes': 3,
+            'router_path': None,
+            'router_min_success': 0.5,
+            'router_explore_every': 20,
+            'fast_path_timeout': 5000,
+            'fast_path_scripts': 5,
+            'http_connections': 20,
+            'detection_mode': 'request',
+            'candidate_window': 0,
+            'candidate_scorers': list(CANDIDATE_SCORERS),
+            'candidate_min_score': -50,
+            'candidate_ad_hosts': list(DEFAULT_AD_HOSTS),
+            'candidate_host_scores': {},
             'verbose': False,
             'm3u8_patterns': [
                 r'playlist\.m3u8',
                 r'index\.m3u8',
                 r'\.m3u8'
             ],
-            'headless': True
+            'headless': True,
+            'adaptive': False,
+            'min_concurrency': 1,
+            'max_concurrency': None,
+            'adaptive_window': 10,
+            'adaptive_latency_target': 10000,
+            'adaptive_failure_threshold': 0.5,
+            'adaptive_cpu_threshold': 0.9,
+            'adaptive_memory_threshold': 0.9,
+            'adaptive_decrease': 0.5,
+            'processes': 1
         }
 
         self.config = {**default_config, **(config or {})}
+        self.block_types = set(self.config['block_resource_types'])
+        # Same matcher as m3u8_patterns: each pattern is wrapped in (?:...)
+        # before joining, falling back to separate regexes if that fails
+        self.block_matcher = (URLMatcher(self.config['block_url_patterns'])
+                              if self.config['block_url_patterns'] else None)
+        self.segment_extensions = tuple(ext.lower() for ext in self.config['segment_extensions'])
+        self.m3u8_matcher = URLMatcher(self.config['m3u8_patterns'])
+        self.candidate_scorers = [CANDIDATE_SCORERS[scorer] if isinstance(scorer, str) else scorer
+                                  for scorer in self.config['candidate_scorers']]
         self.browser: Optional[Browser] = None
         self.contexts: List[BrowserContext] = []
+        self.pool = ContextPool()
+        self.controller: Optional[ConcurrencyController] = None
+        # context -> [warm page, uses] when reuse_pages is enabled
+        self.warm_pages: Dict[BrowserContext, List[Any]] = {}
+        # Recycling state: extractions per context / on the current browser,
+        # and replaced browsers that still have contexts draining
+        self.context_uses: Dict[BrowserContext, int] = {}
+        self.browser_uses = 0
+        self.retired_browsers: List[Browser] = []
+        self._recycle_lock: Optional[asyncio.Lock] = None
+        # Contexts whose renderer crashed, pending replacement
+        self.crashed_contexts: Set[BrowserContext] = set()
+        self._recovery_task: Optional[asyncio.Task] = None
+        # context -> request counters of the extraction currently using it
+        self.traffic: Dict[BrowserContext, Dict] = {}
+        self.http_session = None
+        self.asset_cache = (AssetCache(self.config['asset_cache_dir'], self.config['asset_cache_max_bytes'])
+                            if self.config['asset_cache_dir'] else None)
+        self.asset_cache_types = set(self.config['asset_cache_types'])
+        self.result_cache = (ResultCache(self.config['result_cache_path'], self.config['result_cache_max_entries'])
+                             if self.config['result_cache'] else None)
+        self.playwright = None
+        # host -> [total ms, count] of successful browser extractions, used to
+        # estimate the time saved by the fast path
+        self.browser_times: Dict[str, List[float]] = {}
+        self.router = StrategyRouter(self.config['static_strategies'], self.config['router_path'],
+                                     self.config['router_min_success'],
+                                     explore_every=self.config['router_explore_every'])
         self.stats = {
             'successful': 0,
             'failed': 0,
             'total_time': 0,
-            'average_time': 0
+            'average_time': 0,
+            'retries': 0,
+            'context_recycles': 0,
+            'browser_recycles': 0,
+            'browser_crashes': 0,
+            'page_crashes': 0,
+            'crash_requeues': 0,
+            'init_time': 0,
+            'requests_blocked': 0,
+            'requests_allowed': 0,
+            'segments_blocked': 0,
+            'segment_bytes_saved': 0,
+            'segments_observed': 0,
+            'segment_bytes_observed': 0,
+            'request_detections': 0,
+            'request_detection_time': 0,
+            'average_request_detection': 0,
+            'response_detections': 0,
+            'response_detection_time': 0,
+            'average_response_detection': 0,
+            'routed_to_browser': 0,
+            'asset_cache_lookups': 0,
+            'asset_cache_hits': 0,
+            'asset_cache_bytes_served': 0,
+            'asset_cache_revalidated': 0,
+            'cache_hits': 0,
+            'cache_expired': 0,
+            'cache_evictions': 0,
+            'fast_path': {}
         }
 
     async def initialize(self):
         """Initialize browser and context pool"""
         self.log('Initializing browser pool...')
+        start_time = time.time()
 
         self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
+        self.browser = await self._launch_browser()
+        self._recycle_lock = asyncio.Lock()
+        if self.asset_cache:
+            self.asset_cache.load()
+
+        # Create context pool. In adaptive mode the pool may grow up to the
+        # ceiling and the controller decides how many may be busy at once
+        pool_size = self.config['concurrency']
+        if self.config['adaptive']:
+            self.controller = ConcurrencyController(self.pool, self.config)
+            pool_size = self.controller.ceiling
+
+        self.pool.factory = self._add_context
+        self.pool.max_size = pool_size
+
+        initial_size = 1 if self.config['lazy_init'] else pool_size
+        contexts = await asyncio.gather(*(self._new_context() for _ in range(initial_size)))
+        for context in contexts:
+            self.contexts.append(context)
+            self.pool.add(context)
+
+        self.stats['init_time'] = (time.time() - start_time) * 1000
+        self.log(f'Browser pool initialized with {len(self.contexts)}/{pool_size} contexts '
+                 f'in {self.stats["init_time"] / 1000:.2f}s')
+
+    async def _launch_browser(self) -> Browser:
+        """Launch a Chromium instance with the extractor's flags"""
+        browser = await self.playwright.chromium.launch(
             headless=self.config['headless'],
             args=[
                 '--no-sandbox',
@@ -80,13 +1289,375 @@ class M3U8Extractor:
                 '--disable-gpu'
             ]
         )
+        browser.on('disconnected', self._on_browser_disconnected)
+        return browser
 
-        # Create context pool
-        for i in range(self.config['concurrency']):
-            context = await self.browser.new_context()
-            self.contexts.append(context)
+    def _on_browser_disconnected(self, browser: Browser):
+        """Relaunch in the background if the current browser died unexpectedly"""
+        if browser is not self.browser:
+            # Closed on purpose (close() or a drained retired browser)
+            return
+
+        self.stats['browser_crashes'] += 1
+        self.log('Browser disconnected, relaunching...')
+        self._recovery_task = asyncio.ensure_future(self._recover_browser())
+
+    async def _recover_browser(self):
+        """Background relaunch after a crash; on failure the next recycle retries"""
+        try:
+            async with self._recycle_lock:
+                await self._ensure_browser()
+        except Exception as error:
+            self.log(f'Browser relaunch failed: {error}')
+
+    async def _ensure_browser(self):
+        """Relaunch the browser if it has crashed; caller holds the recycle lock"""
+        if self.browser is None or self.browser.is_connected():
+            # Connected, or closed on purpose by close()
+            return
+
+        self.browser = await self._launch_browser()
+        self.browser_uses = 0
+        await self._migrate_idle_contexts()
+        self.log('Browser relaunched')
+
+    def _on_page_crash(self, context: BrowserContext):
+        self.stats['page_crashes'] += 1
+        self.crashed_contexts.add(context)
+
+    def _is_crashed(self, context: BrowserContext) -> bool:
+        """Whether a context lost its renderer or browser"""
+        return context in self.crashed_contexts or not context.browser.is_connected()
+
+    def _intercepts_requests(self) -> bool:
+        """Whether contexts need a request routing handler"""
+        return bool(self.block_types or self.block_matcher or self.config['block_segments']
+                    or self.asset_cache)
 
-        self.log(f'Browser pool initialized with {len(self.contexts)} contexts')
+    async def _new_context(self) -> BrowserContext:
+        """Create a browser context on the current browser"""
+        if not self._intercepts_requests():
+            return await self.browser.new_context()
+
+        # Service workers would bypass routing, so keep them out
+        context = await self.browser.new_context(service_workers='block')
+
+        async def handle_route(route):
+            await self._route_request(route, context)
+
+        await context.route('**/*', handle_route)
+        return context
+
+    async def _route_request(self, route, context: BrowserContext):
+        """
+        Abort blocked resource types and URL patterns, serve cacheable assets
+        from the asset cache and let the rest through
+        """
+        request = route.request
+        traffic = self.traffic.setdefault(context, self._new_traffic())
+
+        if self.config['block_segments'] and self._is_hls_fetch(request.url, traffic):
+            traffic['blocked'] += 1
+            traffic['segments_blocked'] += 1
+            await route.abort()
+            return
+
+        blocked = (request.resource_type in self.block_types
+                   or (self.block_matcher is not None and self.block_matcher.search(request.url)))
+
+        # Never block the playlist itself, whatever its resource type
+        if blocked and not self._is_m3u8_url(request.url):
+            traffic['blocked'] += 1
+            await route.abort()
+        elif self._is_cacheable(request):
+            traffic['allowed'] += 1
+            await self._serve_cached(route)
+        else:
+            traffic['allowed'] += 1
+            await route.continue_()
+
+    def _is_cacheable(self, request) -> bool:
+        """Whether a request may be answered from the asset cache"""
+        return (self.asset_cache is not None
+                and request.method == 'GET'
+                and request.resource_type in self.asset_cache_types
+                and not self._is_m3u8_url(request.url))
+
+    async def _serve_cached(self, route):
+        """Fulfil a request from the asset cache, or fetch it and store the response"""
+        url = route.request.url
+        self.stats['asset_cache_lookups'] += 1
+        cached = self.asset_cache.get(url)
+        if cached and cached[3] > time.time():
+            status, headers, body, _ = cached
+            self.stats['asset_cache_hits'] += 1
+            self.stats['asset_cache_bytes_served'] += len(body)
+            await route.fulfill(status=status, headers=headers, body=body)
+            return
+
+        # A stale entry is revalidated with its validators instead of refetched
+        request_headers = None
+        if cached:
+            validators = {name.lower(): value for name, value in cached[1].items()}
+            request_headers = dict(route.request.headers)
+            if 'etag' in validators:
+                request_headers['if-none-match'] = validators['etag']
+            if 'last-modified' in validators:
+                request_headers['if-modified-since'] = validators['last-modified']
+
+        try:
+            response = await route.fetch(headers=request_headers)
+            body = await response.body()
+        except Exception as error:
+            self.log(f'Asset fetch failed for {url}: {error}')
+            await route.continue_()
+            return
+
+        freshness = asset_freshness(response.headers)
+        if response.status == 304 and cached:
+            status, headers, body, _ = cached
+            self.stats['asset_cache_hits'] += 1
+            self.stats['asset_cache_revalidated'] += 1
+            self.stats['asset_cache_bytes_served'] += len(body)
+            if freshness is not None:
+                self.asset_cache.refresh(url, time.time() + freshness)
+            await route.fulfill(status=status, headers=headers, body=body)
+            return
+
+        if response.status == 200 and freshness is not None:
+            headers = {name: value for name, value in response.headers.items()
+                       if name.lower() not in _UNCACHED_HEADERS}
+            try:
+                self.asset_cache.put(url, response.status, headers, body, time.time() + freshness)
+            except OSError as error:
+                self.log(f'Could not cache {url}: {error}')
+        await route.fulfill(response=response, body=body)
+
+    def _is_hls_fetch(self, url: str, traffic: Dict) -> bool:
+        """
+        Whether a request is a segment, key or sub-playlist that can be
+        skipped because the playlist URL is (or need not be) known already
+        """
+        if urlsplit(url).path.lower().endswith(self.segment_extensions):
+            return self.config['block_segments'] == 'always' or traffic['found'] is not None
+
+        # Variant playlists fetched after the match
+        return traffic['found'] is not None and url != traffic['found'] and self._is_m3u8_url(url)
+
+    def _is_m3u8_url(self, url: str) -> bool:
+        """Check if URL matches M3U8 patterns"""
+        return self.m3u8_matcher.search(url)
+
+    def _record_detection(self, event: str, detection_time: Optional[float]):
+        """Add a time-to-detection sample (ms) for the 'request' or 'response' event"""
+        if detection_time is None:
+            return
+        self.stats[f'{event}_detections'] += 1
+        self.stats[f'{event}_detection_time'] += detection_time
+        self.stats[f'average_{event}_detection'] = (self.stats[f'{event}_detection_time']
+                                                    / self.stats[f'{event}_detections'])
+
+    @staticmethod
+    def _new_traffic() -> Dict:
+        """Request counters for one extraction, plus the playlist found so far"""
+        return {'blocked': 0, 'allowed': 0, 'segments_blocked': 0, 'found': None}
+
+    def _take_traffic(self, context: BrowserContext) -> Dict:
+        """Return and reset the request counters of a context, adding them to stats"""
+        traffic = self.traffic.pop(context, None) or self._new_traffic()
+        self.stats['requests_blocked'] += traffic['blocked']
+        self.stats['requests_allowed'] += traffic['allowed']
+        self.stats['segments_blocked'] += traffic['segments_blocked']
+        self.stats['segment_bytes_saved'] += traffic['segments_blocked'] * self._segment_size()
+        return traffic
+
+    def _segment_size(self) -> float:
+        """Average observed segment size, or segment_size_estimate before any was seen"""
+        if self.stats['segments_observed']:
+            return self.stats['segment_bytes_observed'] / self.stats['segments_observed']
+        return self.config['segment_size_estimate']
+
+    def _observe_segment(self, response):
+        """Record the size of a segment response that was let through"""
+        if not urlsplit(response.url).path.lower().endswith(self.segment_extensions):
+            return
+        try:
+            size = int(response.headers.get('content-length'))
+        except (TypeError, ValueError):
+            return
+        self.stats['segments_observed'] += 1
+        self.stats['segment_bytes_observed'] += size
+
+    async def _add_context(self) -> BrowserContext:
+        """Pool factory: create a context and track it for close()"""
+        context = await self._new_context()
+        self.contexts.append(context)
+        return context
+
+    def _browser_needs_recycle(self) -> bool:
+        """Whether the current browser hit browser_max_uses or browser_max_rss"""
+        if self.retired_browsers:
+            # Wait until the previous browser has drained
+            return False
+
+        max_uses = self.config['browser_max_uses']
+        if max_uses and self.browser_uses >= max_uses:
+            return True
+
+        max_rss = self.config['browser_max_rss']
+        if max_rss and self.browser_uses % self.config['rss_check_interval'] == 0:
+            rss = _process_tree_rss()
+            if rss is not None and rss > max_rss:
+                self.log(f'Browser RSS {rss:.0f}MB exceeds {max_rss}MB')
+                return True
+
+        return False
+
+    async def _replace_context(self, context: BrowserContext) -> BrowserContext:
+        """
+        Swap a checked-out context for a fresh one on the current browser
+
+        The old context is closed, and so is its browser if it was retired
+        and this was its last context.
+        """
+        new_context = await self._new_context()
+        self.contexts[self.contexts.index(context)] = new_context
+        self.stats['context_recycles'] += 1
+        await self._close_context(context)
+        return new_context
+
+    async def _drop_context(self, context: BrowserContext):
+        """Close a checked-out context without a replacement, shrinking the pool"""
+        self.contexts.remove(context)
+        self.pool.discard()
+        await self._close_context(context)
+
+    async def _close_context(self, context: BrowserContext):
+        """
+        Close a context that is no longer tracked in self.contexts, and its
+        browser if it was retired and this was its last context
+        """
+        self.warm_pages.pop(context, None)
+        self.context_uses.pop(context, None)
+        self.crashed_contexts.discard(context)
+        self.traffic.pop(context, None)
+
+        old_browser = context.browser
+        try:
+            await context.close()
+        except Exception:
+            # Already gone with its crashed browser
+            pass
+
+        if old_browser in self.retired_browsers and not any(c.browser is old_browser for c in self.contexts):
+            self.retired_browsers.remove(old_browser)
+            await old_browser.close()
+            self.log('Retired browser drained and closed')
+
+    async def _migrate_idle_contexts(self):
+        """Replace every idle context with one on the current browser"""
+        idle = self.pool.take_idle()
+        try:
+            while idle:
+                self.pool.release(await self._replace_context(idle[0]))
+                idle.pop(0)
+        finally:
+            # If a replacement failed (e.g. new_context() on the new browser),
+            # hand the rest back so the pool keeps its capacity; they are
+            # replaced when next checked in. Contexts whose browser is gone
+            # are useless and dropped instead.
+            for context in idle:
+                if context.browser.is_connected():
+                    self.pool.release(context)
+                else:
+                    await self._drop_context(context)
+
+    async def _relaunch_browser(self):
+        """
+        Launch a replacement browser without dropping in-flight work
+
+        Idle contexts move to the new browser right away. Busy ones keep
+        running on the old browser and are replaced as they are checked in.
+        The old browser closes once its last context is gone.
+        """
+        self.log('Recycling browser...')
+        self.retired_browsers.append(self.browser)
+        self.browser = await self._launch_browser()
+        self.browser_uses = 0
+        self.stats['browser_recycles'] += 1
+        await self._migrate_idle_contexts()
+
+    async def _recycle(self, context: BrowserContext) -> BrowserContext:
+        """
+        Apply recycling policies to a context that is still checked out
+
+        Returns:
+            BrowserContext: The context to check back in (possibly a new one)
+        """
+        self.context_uses[context] = self.context_uses.get(context, 0) + 1
+        self.browser_uses += 1
+
+        try:
+            async with self._recycle_lock:
+                await self._ensure_browser()
+                if self._browser_needs_recycle():
+                    await self._relaunch_browser()
+
+                max_uses = self.config['context_max_uses']
+                if (context.browser is not self.browser or context in self.crashed_contexts
+                        or (max_uses and self.context_uses[context] >= max_uses)):
+                    return await self._replace_context(context)
+        except Exception as error:
+            self.log(f'Recycling failed: {error}')
+
+        return context
+
+    async def _open_page(self, context: BrowserContext) -> Page:
+        """Get a page for one extraction: the context's warm page or a new one"""
+        if self.config['reuse_pages']:
+            warm = self.warm_pages.get(context)
+            if warm and not warm[0].is_closed():
+                return warm[0]
+
+        page = await context.new_page()
+        page.on('crash', lambda _: self._on_page_crash(context))
+        if self.config['reuse_pages']:
+            self.warm_pages[context] = [page, 0]
+        return page
+
+    async def _release_page(self, context: BrowserContext, page: Page, embed_url: str):
+        """
+        Close a page after extraction, or reset it for reuse
+
+        A warm page is navigated to about:blank, which also aborts anything
+        still loading, and optionally has its cookies and storage cleared.
+        It is closed instead once it has reached page_max_uses or if the
+        reset fails.
+        """
+        warm = self.warm_pages.get(context)
+        if not warm or warm[0] is not page:
+            await page.close()
+            return
+
+        warm[1] += 1
+        try:
+            if warm[1] >= self.config['page_max_uses']:
+                raise RuntimeError('page reached page_max_uses')
+
+            await page.goto('about:blank')
+            if self.config['clear_storage']:
+                await context.clear_cookies()
+                parts = urlsplit(embed_url)
+                cdp = await context.new_cdp_session(page)
+                await cdp.send('Storage.clearDataForOrigin', {
+                    'origin': f'{parts.scheme}://{parts.netloc}',
+                    'storageTypes': 'all'
+                })
+                await cdp.detach()
+        except Exception:
+            del self.warm_pages[context]
+            if not page.is_closed():
+                await page.close()
 
     async def extract_single(self, embed_url: str, context: BrowserContext) -> Dict:
         """
@@ -96,69 +1667,163 @@ class M3U8Extractor:
             embed_url: URL of the embed page
             context: Playwright browser context
 
+        Every playlist URL seen on the detection event is a candidate. The
+        first acceptable one ends the wait, after which further candidates
+        are collected for `candidate_window` ms; all are then ranked by the
+        configured scorers and the best one is returned.
+
         Returns:
-            dict: Result with keys: embedUrl, m3u8Url, success, time, error
+            dict: Result with keys: embedUrl, m3u8Url (best candidate), success,
+            time, error, requestsBlocked, requestsAllowed, strategy and
+            candidates (ranked, best first, as {'url', 'type', 'score'})
         """
         start_time = time.time()
-        page = await context.new_page()
+        traffic = self.traffic[context] = self._new_traffic()
+        try:
+            page = await self._open_page(context)
+        except Exception as error:
+            # The context or its browser died while idle (e.g. before recovery
+            # migrated it): mark it crashed so the URL is requeued and the
+            # context replaced, instead of failing the whole run
+            self.crashed_contexts.add(context)
+            self.stats['failed'] += 1
+            traffic = self._take_traffic(context)
+            return {
+                'embedUrl': embed_url,
+                'm3u8Url': None,
+                'success': False,
+                'time': (time.time() - start_time) * 1000,
+                'error': str(error),
+                'requestsBlocked': traffic['blocked'],
+                'requestsAllowed': traffic['allowed'],
+                'strategy': 'browser',
+                'candidates': []
+            }
 
         found_m3u8 = None
         m3u8_future = asyncio.Future()
+        window = self.config['candidate_window']
+        # Playlist URL -> candidate, in discovery order
+        candidates: Dict[str, Dict] = {}
+        # Reads of candidate playlist bodies, to tell master from media
+        body_reads: List[asyncio.Task] = []
+        # Time (ms) at which each playlist URL was requested / answered
+        seen: Dict[str, Dict[str, float]] = {'request': {}, 'response': {}}
+
+        def detect(url: str, event: str):
+            if not self._is_m3u8_url(url):
+                return
 
-        async def handle_response(response):
-            nonlocal found_m3u8
-            if found_m3u8:
+            seen[event].setdefault(url, (time.time() - start_time) * 1000)
+            if event != self.config['detection_mode'] or url in candidates:
+                return
+
+            candidate = candidates[url] = {'url': url, 'type': None}
+            if m3u8_future.done() or self._score_candidate(candidate) < self.config['candidate_min_score']:
                 return
 
-            url = response.url
+            # Without a window the first acceptable playlist is the answer, so
+            # segment blocking can start right away
+            if not window:
+                traffic['found'] = url
+            m3u8_future.set_result(url)
 
-            # Check if URL matches M3U8 patterns
-            for pattern in self.config['m3u8_patterns']:
-                if re.search(pattern, url, re.IGNORECASE):
-                    found_m3u8 = url
-                    if not m3u8_future.done():
-                        m3u8_future.set_result(url)
-                    break
+        async def read_type(response):
+            try:
+                body = await response.text()
+            except Exception:
+                return
+            if response.url in candidates:
+                candidates[response.url]['type'] = 'master' if '#EXT-X-STREAM-INF' in body else 'media'
+
+        def handle_request(request):
+            detect(request.url, 'request')
+
+        def handle_response(response):
+            detect(response.url, 'response')
+            if self.config['block_segments']:
+                self._observe_segment(response)
+            if window and response.url in candidates and not traffic['found']:
+                body_reads.append(asyncio.ensure_future(read_type(response)))
+
+        def detach():
+            context.remove_listener('request', handle_request)
+            page.remove_listener('response', handle_response)
 
         try:
-            # Listen for responses
+            # Requests are watched on the whole context so iframes and workers
+            # count too; responses are always watched to measure the difference
+            context.on('request', handle_request)
             page.on('response', handle_response)
 
-            # Set timeout
-            timeout_task = asyncio.create_task(
-                asyncio.sleep(self.config['timeout'] / 1000)
-            )
+            navigation_timeout = self.config['navigation_timeout'] or self.config['timeout']
+            detection_timeout = (self.config['detection_timeout'] or self.config['timeout']) / 1000
 
-            # Load page
+            # Load page; navigation only has to reach an early milestone, the
+            # playlist is then awaited on the separate detection clock
             goto_task = asyncio.create_task(
-                page.goto(embed_url, wait_until='networkidle', timeout=self.config['timeout'])
-            )
-
-            # Wait for M3U8 or timeout
-            done, pending = await asyncio.wait(
-                [m3u8_future, timeout_task, goto_task],
-                return_when=asyncio.FIRST_COMPLETED
+                page.goto(embed_url, wait_until=self.config['wait_until'], timeout=navigation_timeout)
             )
 
-            # Cancel pending tasks
-            for task in pending:
-                task.cancel()
-
+            try:
+                done, _ = await asyncio.wait(
+                    [m3u8_future, goto_task],
+                    timeout=detection_timeout,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if goto_task in done and not m3u8_future.done():
+                    error = goto_task.exception()
+                    # A navigation timeout is not fatal, players may still load
+                    if error is not None and not isinstance(error, PlaywrightTimeoutError):
+                        raise error
+
+                    remaining = detection_timeout - (time.time() - start_time)
+                    if remaining > 0:
+                        await asyncio.wait([m3u8_future], timeout=remaining)
+
+                # Keep collecting candidates (ads first, then content; master
+                # then variants) before deciding
+                if window and m3u8_future.done():
+                    await asyncio.sleep(window / 1000)
+            finally:
+                if not goto_task.done():
+                    goto_task.cancel()
+                # Mark the outcome as retrieved, it is handled above
+                goto_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+            ranked = self._rank_candidates(list(candidates.values()))
+            found_m3u8 = self._best_candidate(ranked) if m3u8_future.done() else None
+            traffic['found'] = found_m3u8
             elapsed = (time.time() - start_time) * 1000  # Convert to ms
 
-            await page.close()
+            detach()
+            for task in body_reads:
+                task.cancel()
+            await asyncio.gather(*body_reads, return_exceptions=True)
+            await self._release_page(context, page, embed_url)
+            traffic = self._take_traffic(context)
 
             if found_m3u8:
                 self.stats['successful'] += 1
                 self.stats['total_time'] += elapsed
                 self.stats['average_time'] = self.stats['total_time'] / self.stats['successful']
+                self._record_detection('request', seen['request'].get(found_m3u8))
+                self._record_detection('response', seen['response'].get(found_m3u8))
+                browser_time = self.browser_times.setdefault(urlsplit(embed_url).hostname, [0, 0])
+                browser_time[0] += elapsed
+                browser_time[1] += 1
 
                 return {
                     'embedUrl': embed_url,
                     'm3u8Url': found_m3u8,
                     'success': True,
                     'time': elapsed,
-                    'error': None
+                    'error': None,
+                    'requestsBlocked': traffic['blocked'],
+                    'requestsAllowed': traffic['allowed'],
+                    'strategy': 'browser',
+                    'candidates': ranked
                 }
             else:
                 self.stats['failed'] += 1
@@ -167,23 +1832,398 @@ class M3U8Extractor:
                     'm3u8Url': None,
                     'success': False,
                     'time': elapsed,
-                    'error': 'M3U8 URL not found within timeout'
+                    'error': ('Only rejected M3U8 candidates found within timeout' if ranked
+                              else 'M3U8 URL not found within timeout'),
+                    'requestsBlocked': traffic['blocked'],
+                    'requestsAllowed': traffic['allowed'],
+                    'strategy': 'browser',
+                    'candidates': ranked
                 }
 
         except Exception as error:
             elapsed = (time.time() - start_time) * 1000
             self.stats['failed'] += 1
 
-            await page.close()
+            detach()
+            for task in body_reads:
+                task.cancel()
+            await asyncio.gather(*body_reads, return_exceptions=True)
+            await self._release_page(context, page, embed_url)
+            traffic = self._take_traffic(context)
 
             return {
                 'embedUrl': embed_url,
                 'm3u8Url': None,
                 'success': False,
                 'time': elapsed,
-                'error': str(error)
+                'error': str(error),
+                'requestsBlocked': traffic['blocked'],
+                'requestsAllowed': traffic['allowed'],
+                'strategy': 'browser',
+                'candidates': []
             }
 
+    async def _http(self):
+        """Shared aiohttp session with a bounded connection pool (created lazily)"""
+        if self.http_session is None:
+            import aiohttp
+
+            self.http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.config['http_connections'], ttl_dns_cache=300),
+                headers={'User-Agent': DEFAULT_USER_AGENT}
+            )
+        return self.http_session
+
+    async def _fetch_text(self, url: str, referer: Optional[str] = None) -> str:
+        """GET a URL with the shared session and return its body as text"""
+        session = await self._http()
+        headers = {'Referer': referer} if referer else {}
+        async with session.get(url, headers=headers) as response:
+            response.raise_for_status()
+            return await response.text(errors='replace')
+
+    def _score_candidate(self, candidate: Dict) -> float:
+        """Sum of all configured scorers for a candidate playlist"""
+        return sum(scorer(candidate, self.config) for scorer in self.candidate_scorers)
+
+    def _rank_candidates(self, candidates: List[Dict]) -> List[Dict]:
+        """
+        Score candidates and rank them, best first (ties keep discovery order)
+
+        Returns:
+            list: Candidates as {'url', 'type', 'score'}
+        """
+        ranked = [{'url': candidate['url'], 'type': candidate.get('type'),
+                   'score': self._score_candidate(candidate)} for candidate in candidates]
+        ranked.sort(key=lambda candidate: -candidate['score'])
+        return ranked
+
+    def _best_candidate(self, ranked: List[Dict]) -> Optional[str]:
+        """URL of the top ranked candidate if it is acceptable"""
+        if ranked and ranked[0]['score'] >= self.config['candidate_min_score']:
+            return ranked[0]['url']
+        return None
+
+    def _apply_strategies(self, documents: List[Tuple[str, str]],
+                          strategies: List[str]) -> Optional[Tuple[str, List[Dict]]]:
+        """
+        Run browserless strategies over fetched (url, text) documents
+
+        Every playlist URL a strategy finds across the documents is a
+        candidate; the first strategy with an acceptable candidate wins.
+
+        Returns:
+            tuple: (strategy, ranked candidates) for the first hit, or None
+        """
+        for name in strategies:
+            urls = []
+            for base_url, text in documents:
+                urls.extend(url for url in STATIC_STRATEGIES[name](text, base_url)
+                            if self._is_m3u8_url(url) and url not in urls)
+            ranked = self._rank_candidates([{'url': url} for url in urls])
+            if self._best_candidate(ranked):
+                return name, ranked
+        return None
+
+    async def _scan_static(self, embed_url: str, strategies: List[str],
+                           referer: Optional[str] = None) -> Optional[Tuple[str, List[Dict]]]:
+        """
+        Fetch the embed HTML, then its linked scripts, and run the strategies on
+        them. With 'iframe', embedded iframes are scanned the same way last.
+        """
+        scanners = [name for name in strategies if name in STATIC_STRATEGIES]
+        page_html = await self._fetch_text(embed_url, referer=referer)
+        hit = self._apply_strategies([(embed_url, page_html)], scanners)
+        if hit:
+            return hit
+
+        # Linked scripts are only worth fetching if something will scan them
+        # (an 'iframe'-only plan goes straight to the iframes)
+        if scanners:
+            script_urls = [urljoin(embed_url, src) for src in SCRIPT_SRC_PATTERN.findall(page_html)]
+            script_urls = script_urls[:self.config['fast_path_scripts']]
+            scripts = await asyncio.gather(
+                *(self._fetch_text(url, referer=embed_url) for url in script_urls),
+                return_exceptions=True
+            )
+            documents = [(url, script) for url, script in zip(script_urls, scripts)
+                         if not isinstance(script, Exception)]
+            hit = self._apply_strategies(documents, scanners)
+            if hit:
+                return hit
+        if 'iframe' not in strategies:
+            return None
+        return await self._scan_iframes(embed_url, page_html)
+
+    async def _scan_iframes(self, embed_url: str, page_html: str) -> Optional[Tuple[str, List[Dict]]]:
+        """Scan the iframes embedded in a page with the configured scanners"""
+        iframe_urls = [urljoin(embed_url, src) for src in IFRAME_SRC_PATTERN.findall(page_html)]
+        iframe_scanners = [name for name in self.config['static_strategies'] if name in STATIC_STRATEGIES]
+        for iframe_url in iframe_urls[:self.config['fast_path_iframes']]:
+            if not iframe_url.startswith(('http://', 'https://')):
+                continue
+            try:
+                hit = await self._scan_static(iframe_url, iframe_scanners, referer=embed_url)
+            except Exception as error:
+                self.log(f'Fast path iframe {iframe_url} failed: {error!r}')
+                continue
+            if hit:
+                return 'iframe', hit[1]
+        return None
+
+    async def extract_static(self, embed_url: str, strategies: Optional[List[str]] = None) -> Optional[Dict]:
+        """
+        Try to extract the M3U8 URL without a browser
+
+        Fetches the embed page over plain HTTP and runs the browserless
+        strategies over the HTML, its inline scripts and up to
+        `fast_path_scripts` linked scripts.
+
+        Args:
+            embed_url: URL of the embed page
+            strategies: Strategy names from STATIC_STRATEGIES, default
+                config['static_strategies']
+
+        Returns:
+            dict: Successful result (same keys as extract_single(), strategy
+            set to the one that hit), or None on a miss
+        """
+        start_time = time.time()
+        host = urlsplit(embed_url).hostname
+        strategies = strategies or self.config['static_strategies']
+        host_stats = self.stats['fast_path'].setdefault(
+            host, {'attempts': 0, 'hits': 0, 'time': 0, 'hit_time': 0, 'strategies': {}}
+        )
+        host_stats['attempts'] += 1
+
+        try:
+            hit = await asyncio.wait_for(
+                self._scan_static(embed_url, strategies),
+                self.config['fast_path_timeout'] / 1000
+            )
+        except Exception as error:
+            self.log(f'Fast path failed for {embed_url}: {error!r}')
+            hit = None
+
+        elapsed = (time.time() - start_time) * 1000
+        host_stats['time'] += elapsed
+        if not hit:
+            for name in strategies:
+                self.router.record(host, name, False)
+            return None
+
+        strategy, candidates = hit
+        m3u8_url = candidates[0]['url']
+        # Strategies run in chain order, and 'iframe' only after every scanner
+        # missed, so everything tried before the winner counts as a miss
+        if strategy == 'iframe':
+            missed = [name for name in strategies if name != 'iframe']
+        else:
+            missed = strategies[:strategies.index(strategy)]
+        for name in missed:
+            self.router.record(host, name, False)
+        self.router.record(host, strategy, True, elapsed)
+        host_stats['hits'] += 1
+        host_stats['hit_time'] += elapsed
+        host_stats['strategies'][strategy] = host_stats['strategies'].get(strategy, 0) + 1
+
+        self.stats['successful'] += 1
+        self.stats['total_time'] += elapsed
+        self.stats['average_time'] = self.stats['total_time'] / self.stats['successful']
+
+        return {
+            'embedUrl': embed_url,
+            'm3u8Url': m3u8_url,
+            'success': True,
+            'time': elapsed,
+            'error': None,
+            'requestsBlocked': 0,
+            'requestsAllowed': 0,
+            'strategy': strategy,
+            'candidates': candidates
+        }
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Backoff delay in seconds before retry number `attempt` (1-based)"""
+        delay = self.config['retry_backoff'] * self.config['retry_backoff_factor'] ** (attempt - 1)
+        return min(delay, self.config['retry_backoff_max']) / 1000
+
+    async def _extract_pooled(self, embed_url: str, attempt: int) -> Tuple[Dict, bool]:
+        """
+        Check out a pooled context and extract one URL with it
+
+        Returns:
+            tuple: (result, crashed) where crashed tells whether the page or
+            browser died during the extraction
+        """
+        host = urlsplit(embed_url).hostname
+        if self.config['fast_path'] and attempt == 0:
+            strategies = self.router.plan(host)
+            if strategies:
+                result = await self.extract_static(embed_url, strategies)
+                if result:
+                    return result, False
+            else:
+                self.stats['routed_to_browser'] += 1
+
+        try:
+            context = await self.pool.acquire()
+        except Exception as error:
+            # The pool could not create a context (e.g. the browser is being
+            # relaunched); report it as a crash so the URL is requeued
+            self.stats['failed'] += 1
+            return {
+                'embedUrl': embed_url,
+                'm3u8Url': None,
+                'success': False,
+                'time': 0,
+                'error': f'No browser context available: {error}',
+                'requestsBlocked': 0,
+                'requestsAllowed': 0,
+                'strategy': 'browser',
+                'candidates': []
+            }, True
+
+        try:
+            if attempt == 0 or not self.config['retry_fresh_context']:
+                result = await self.extract_single(embed_url, context)
+                crashed = self._is_crashed(context)
+            else:
+                # The pooled context still holds the slot, so concurrency is honoured
+                fresh_context = await self._new_context()
+                try:
+                    result = await self.extract_single(embed_url, fresh_context)
+                    crashed = self._is_crashed(fresh_context)
+                finally:
+                    self.warm_pages.pop(fresh_context, None)
+                    self.crashed_contexts.discard(fresh_context)
+                    self.traffic.pop(fresh_context, None)
+                    try:
+                        await fresh_context.close()
+                    except Exception:
+                        pass
+
+            if self.config['fast_path'] and not crashed:
+                self.router.record(host, 'browser', result['success'], result['time'])
+            return result, crashed
+        finally:
+            self.pool.release(await self._recycle(context))
+
+    async def _run_queue(self, embed_urls: Union[List[str], AsyncIterable[str]], retries: int,
+                         on_result: Callable[[int, Dict], None],
+                         startup: Optional[Callable[[], Awaitable[None]]] = None):
+        """
+        Run embed URLs through the context pool with a sliding window
+
+        Every worker pulls the next URL as soon as its previous extraction
+        ends, so one slow embed never stalls the others. A failed URL is put
+        back on the queue after a backoff delay, without holding a worker,
+        until its `retries` or the run's retry budget are used up. URLs whose
+        page or browser crashed are requeued straight away (up to
+        `crash_requeues` times) without spending a retry.
+
+        Args:
+            embed_urls: List of embed page URLs, or an async iterable that
+                feeds URLs into the queue as they are discovered (pipeline
+                mode); the run ends once it is exhausted and drained
+            retries: Number of retries per failed URL
+            on_result: Called with (index, result) once the outcome of a URL
+                is decided; index is the position in embed_urls, or the
+                arrival order when streaming
+            startup: Awaited once the URL source is being consumed and before
+                the workers start, e.g. initialize(), so browser startup
+                overlaps discovery instead of delaying it
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        streaming = hasattr(embed_urls, '__aiter__')
+        # Known once startup has sized the pool
+        workers = 0
+        budget = self.config['retry_budget']
+        scheduled_retries = []
+        queued = 0
+        remaining = 0
+        fed = False
+
+        def enqueue(url: str):
+            nonlocal queued, remaining
+            queue.put_nowait((queued, url, 0, 0))
+            queued += 1
+            remaining += 1
+
+        def finish_if_done():
+            # Before the workers start there is nobody to stop yet
+            if fed and remaining == 0 and workers:
+                for _ in range(workers):
+                    queue.put_nowait(None)
+
+        async def feed():
+            nonlocal fed
+            try:
+                async for url in embed_urls:
+                    enqueue(url)
+            finally:
+                fed = True
+                finish_if_done()
+
+        feeder = None
+        if streaming:
+            feeder = asyncio.ensure_future(feed())
+        else:
+            for url in embed_urls:
+                enqueue(url)
+            fed = True
+
+        async def worker():
+            nonlocal remaining, budget
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                index, url, attempt, crashes = item
+
+                result, crashed = await self._extract_pooled(url, attempt)
+
+                if self.controller and result['strategy'] == 'browser':
+                    self.controller.record(result)
+
+                if crashed and crashes < self.config['crash_requeues']:
+                    self.stats['crash_requeues'] += 1
+                    self.log(f'Requeueing {url} after a crash ({result["error"]})')
+                    queue.put_nowait((index, url, attempt, crashes + 1))
+                    continue
+
+                if not result['success'] and attempt < retries and budget != 0:
+                    if budget is not None:
+                        budget -= 1
+                    delay = self._retry_delay(attempt + 1)
+                    self.stats['retries'] += 1
+                    self.log(f'Retrying {url} in {delay:.1f}s ({result["error"]})')
+                    scheduled_retries.append(
+                        loop.call_later(delay, queue.put_nowait, (index, url, attempt + 1, crashes))
+                    )
+                    continue
+
+                remaining -= 1
+                on_result(index, result)
+                finish_if_done()
+
+        try:
+            if startup:
+                await startup()
+            workers = self.pool.capacity if streaming else min(self.pool.capacity, len(embed_urls))
+            finish_if_done()
+            await asyncio.gather(*(worker() for _ in range(workers)))
+            if feeder:
+                # Surface any error raised by the URL source
+                await feeder
+        finally:
+            for handle in scheduled_retries:
+                handle.cancel()
+            if feeder and not feeder.done():
+                feeder.cancel()
+                await asyncio.gather(feeder, return_exceptions=True)
+
     async def extract_batch(self, embed_urls: List[str]) -> List[Dict]:
         """
         Extract M3U8 URLs from multiple embed pages in parallel
@@ -198,88 +2238,280 @@ class M3U8Extractor:
             await self.initialize()
 
         self.log(f'Extracting M3U8 from {len(embed_urls)} embeds...')
-        results = []
+        results: List[Optional[Dict]] = [None] * len(embed_urls)
+        batch_start_time = time.time()
+        completed = 0
 
-        # Process in batches based on concurrency
-        for i in range(0, len(embed_urls), self.config['concurrency']):
-            batch = embed_urls[i:i + self.config['concurrency']]
-            batch_start_time = time.time()
+        def on_result(index: int, result: Dict):
+            nonlocal completed
+            results[index] = result
+            completed += 1
+            self.log(f'[{completed}/{len(embed_urls)}] {"OK" if result["success"] else "FAILED"} {result["embedUrl"]}')
 
-            self.log(f'Processing batch {i // self.config["concurrency"] + 1}/{(len(embed_urls) + self.config["concurrency"] - 1) // self.config["concurrency"]} ({len(batch)} embeds)')
+        await self._run_queue(embed_urls, 0, on_result)
 
-            # Process batch in parallel
-            tasks = []
-            for idx, url in enumerate(batch):
-                context_index = idx % len(self.contexts)
-                task = self.extract_single(url, self.contexts[context_index])
-                tasks.append(task)
+        batch_time = (time.time() - batch_start_time)
+        success_count = sum(1 for r in results if r['success'])
 
-            batch_results = await asyncio.gather(*tasks)
-            results.extend(batch_results)
-
-            batch_time = (time.time() - batch_start_time)
-            success_count = sum(1 for r in batch_results if r['success'])
-
-            self.log(f'Batch completed in {batch_time:.1f}s - {success_count}/{len(batch)} successful')
+        self.log(f'Batch completed in {batch_time:.1f}s - {success_count}/{len(embed_urls)} successful')
 
         self.log(f'\nExtraction complete: {self.stats["successful"]} successful, {self.stats["failed"]} failed')
         self.log(f'Average extraction time: {self.stats["average_time"] / 1000:.2f}s')
+        self.log(f'Average context wait: {self.pool.stats["average_wait"] / 1000:.2f}s')
 
         return results
 
+    async def extract_iter(self, embed_urls: Union[List[str], AsyncIterable[str]]) -> AsyncIterator[Dict]:
+        """
+        Extract M3U8 URLs, yielding each result as soon as it is decided
+
+        Results arrive in completion order, not input order. Failed URLs are
+        retried inline (up to config['retries']) and only yielded once they
+        succeed or run out of retries, so each URL is yielded exactly once.
+
+        embed_urls may also be an async iterable (pipeline mode): each URL
+        enters the queue as soon as the source produces it, so discovery and
+        extraction overlap. Duplicates are not filtered in that case.
+
+        Usage:
+            async for result in extractor.extract_iter(embed_urls):
+                publish(result)
+
+        Args:
+            embed_urls: List of embed page URLs, or an async iterable of them
+
+        Yields:
+            dict: Result dictionary, same shape as extract_single()
+        """
+        streaming = hasattr(embed_urls, '__aiter__')
+        output: asyncio.Queue = asyncio.Queue()
+
+        # Cached results go straight to the output, only misses are queued
+        if self.result_cache and streaming:
+            embed_urls = self._uncached(embed_urls, output)
+        elif self.result_cache:
+            hits = [self._cached_result(url) for url in embed_urls]
+            for result in filter(None, hits):
+                output.put_nowait(result)
+            embed_urls = [url for url, hit in zip(embed_urls, hits) if not hit]
+
+        if streaming:
+            self.log('Streaming M3U8 extraction from a URL source...')
+        else:
+            self.log(f'Streaming M3U8 extraction for {len(embed_urls)} embeds...')
+
+        # Initialized inside the run so a URL source is already being consumed
+        # while the browser starts
+        startup = self.initialize if not self.browser and (streaming or embed_urls) else None
+
+        def on_result(index: int, result: Dict):
+            self._cache_result(result)
+            output.put_nowait(result)
+
+        async def run():
+            try:
+                await self._run_queue(embed_urls, self.config['retries'], on_result, startup)
+            finally:
+                output.put_nowait(None)
+
+        runner = asyncio.create_task(run())
+        try:
+            while True:
+                result = await output.get()
+                if result is None:
+                    break
+                yield result
+
+            # Surface any error raised inside the worker pool
+            await runner
+        finally:
+            if not runner.done():
+                runner.cancel()
+                await asyncio.gather(runner, return_exceptions=True)
+
+    def _cached_result(self, embed_url: str) -> Optional[Dict]:
+        """Result cache lookup, as a result dict with strategy 'cache'"""
+        cached, expired = self.result_cache.get(embed_url)
+        if expired:
+            self.stats['cache_expired'] += 1
+        if not cached:
+            return None
+
+        self.stats['cache_hits'] += 1
+        return {**cached, 'embedUrl': embed_url, 'time': 0, 'requestsBlocked': 0,
+                'requestsAllowed': 0, 'strategy': 'cache'}
+
+    async def _uncached(self, embed_urls: AsyncIterable[str], output: asyncio.Queue) -> AsyncIterator[str]:
+        """Pass through URLs missing from the result cache, putting hits on output"""
+        async for url in embed_urls:
+            cached = self._cached_result(url)
+            if cached:
+                output.put_nowait(cached)
+            else:
+                yield url
+
+    def _cache_result(self, result: Dict):
+        """
+        Store a successful result in the result cache
+
+        Signed playlist URLs expire at their expiry/e=/expires= timestamp
+        (less result_cache_margin), others after result_cache_ttl.
+        """
+        if not self.result_cache or not result['success']:
+            return
+
+        expiry = playlist_expiry(result['m3u8Url'])
+        if expiry is not None:
+            expires = expiry - self.config['result_cache_margin']
+        else:
+            expires = time.time() + self.config['result_cache_ttl']
+        if expires > time.time():
+            self.stats['cache_evictions'] += self.result_cache.put(result['embedUrl'], result, expires)
+
     async def extract(self, embed_urls: List[str]) -> List[Dict]:
         """
         Extract M3U8 URLs with automatic retry on failure
 
+        Retries are rescheduled inline with backoff (see extract_iter), so
+        there is no barrier between a first pass and a retry pass. With
+        result_cache on, unexpired cached results are returned without
+        touching the browser pool (strategy 'cache').
+
         Args:
             embed_urls: List of embed page URLs
 
         Returns:
-            list: List of result dictionaries
+            list: List of result dictionaries, in input order
         """
-        results = await self.extract_batch(embed_urls)
-
-        # Retry failed extractions if retries enabled
-        if self.config['retries'] > 0:
-            failed = [r for r in results if not r['success']]
+        start_time = time.time()
+        results_by_url: Dict[str, Dict] = {}
 
-            if failed:
-                self.log(f'\nRetrying {len(failed)} failed extractions...')
-                retry_urls = [r['embedUrl'] for r in failed]
-                retry_results = await self.extract_batch(retry_urls)
+        # Duplicate URLs are extracted once and share a result
+        async for result in self.extract_iter(list(dict.fromkeys(embed_urls))):
+            results_by_url[result['embedUrl']] = result
 
-                # Update results with retry results
-                for retry_result in retry_results:
-                    for i, result in enumerate(results):
-                        if result['embedUrl'] == retry_result['embedUrl'] and retry_result['success']:
-                            results[i] = retry_result
+        self.log(f'\nExtraction complete in {time.time() - start_time:.1f}s: '
+                 f'{self.stats["successful"]} successful, {self.stats["failed"]} failed, '
+                 f'{self.stats["retries"]} retries')
 
-        return results
+        return [results_by_url[url] for url in embed_urls]
 
     async def close(self):
         """Close all browser contexts and browser"""
         self.log('Closing browser pool...')
+        if self._recovery_task:
+            # A relaunch after a crash must not outlive (or race) the shutdown
+            self._recovery_task.cancel()
+            try:
+                await self._recovery_task
+            except asyncio.CancelledError:
+                pass
+            self._recovery_task = None
         for context in self.contexts:
             await context.close()
+        for browser in self.retired_browsers:
+            await browser.close()
         if self.browser:
-            await self.browser.close()
-        await self.playwright.stop()
+            # Detach first so the disconnect is not mistaken for a crash
+            browser, self.browser = self.browser, None
+            await browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
         self.contexts = []
+        self.warm_pages = {}
+        self.context_uses = {}
+        self.browser_uses = 0
+        self.retired_browsers = []
+        self.crashed_contexts = set()
+        self.pool.clear()
         self.browser = None
+        if self.http_session:
+            await self.http_session.close()
+            self.http_session = None
+        try:
+            self.router.save()
+        except OSError as error:
+            self.log(f'Could not save strategy router to {self.config["router_path"]}: {error}')
+        if self.result_cache:
+            try:
+                self.result_cache.save()
+            except OSError as error:
+                self.log(f'Could not save result cache to {self.config["result_cache_path"]}: {error}')
         self.log('Browser pool closed')
 
     def get_stats(self) -> Dict:
         """Get extraction statistics"""
-        return dict(self.stats)
+        stats = dict(self.stats)
+        stats['fast_path'] = {host: self._fast_path_summary(host, values)
+                              for host, values in self.stats['fast_path'].items()}
+        stats.update({f'pool_{key}': value for key, value in self.pool.stats.items()})
+        stats['concurrency_target'] = self.controller.target if self.controller else self.config['concurrency']
+        if self.asset_cache:
+            stats['asset_cache_hit_rate'] = (self.stats['asset_cache_hits'] / self.stats['asset_cache_lookups']
+                                             if self.stats['asset_cache_lookups'] else 0)
+            stats['asset_cache_size'] = self.asset_cache.size
+            stats['asset_cache_evictions'] = self.asset_cache.evictions
+        return stats
+
+    def _fast_path_summary(self, host: str, values: Dict) -> Dict:
+        """
+        Per-host fast path stats with hit rate and estimated time saved
+
+        Time saved compares each hit with the average successful browser
+        extraction for the same host, or over all hosts if this one never
+        needed the browser.
+        """
+        total, count = self.browser_times.get(host) or [
+            sum(times[0] for times in self.browser_times.values()),
+            sum(times[1] for times in self.browser_times.values())
+        ]
+        summary = dict(values)
+        summary['strategies'] = dict(values['strategies'])
+        summary['hit_rate'] = values['hits'] / values['attempts'] if values['attempts'] else 0
+        summary['time_saved'] = max(0, values['hits'] * total / count - values['hit_time']) if count else 0
+        return summary
 
     def reset_stats(self):
         """Reset statistics"""
+        self.browser_times = {}
         self.stats = {
             'successful': 0,
             'failed': 0,
             'total_time': 0,
-            'average_time': 0
+            'average_time': 0,
+            'retries': 0,
+            'context_recycles': 0,
+            'browser_recycles': 0,
+            'browser_crashes': 0,
+            'page_crashes': 0,
+            'crash_requeues': 0,
+            'init_time': 0,
+            'requests_blocked': 0,
+            'requests_allowed': 0,
+            'segments_blocked': 0,
+            'segment_bytes_saved': 0,
+            'segments_observed': 0,
+            'segment_bytes_observed': 0,
+            'request_detections': 0,
+            'request_detection_time': 0,
+            'average_request_detection': 0,
+            'response_detections': 0,
+            'response_detection_time': 0,
+            'average_response_detection': 0,
+            'routed_to_browser': 0,
+            'asset_cache_lookups': 0,
+            'asset_cache_hits': 0,
+            'asset_cache_bytes_served': 0,
+            'asset_cache_revalidated': 0,
+            'cache_hits': 0,
+            'cache_expired': 0,
+            'cache_evictions': 0,
+            'fast_path': {}
         }
+        self.pool.reset_stats()
+        if self.asset_cache:
+            self.asset_cache.evictions = 0
 
     def log(self, message: str):
         """Log message if verbose enabled"""
@@ -287,10 +2519,154 @@ class M3U8Extractor:
             print(f'[M3U8-Extractor] {message}')
 
 
+# Averages recomputed from their (total, count) keys when merging shard stats
+_STAT_AVERAGES = {
+    'average_time': ('total_time', 'successful'),
+    'pool_average_wait': ('pool_wait_time', 'pool_acquisitions'),
+    'average_request_detection': ('request_detection_time', 'request_detections'),
+    'average_response_detection': ('response_detection_time', 'response_detections'),
+    'hit_rate': ('hits', 'attempts'),
+    'asset_cache_hit_rate': ('asset_cache_hits', 'asset_cache_lookups')
+}
+
+# Values that overlap across shards running in parallel, so merge by maximum
+_STAT_MAXIMA = {'init_time'}
+
+
+def merge_stats(stats_list: List[Dict]) -> Dict:
+    """
+    Merge get_stats() dictionaries from several extractors into one
+
+    Counters and totals are summed, max_* values take the maximum and
+    averages are recomputed from the merged totals.
+
+    Args:
+        stats_list: List of stats dictionaries
+
+    Returns:
+        dict: Merged statistics in the same shape as get_stats()
+    """
+    merged: Dict = {}
+    for stats in stats_list:
+        for key, value in stats.items():
+            if isinstance(value, dict):
+                merged[key] = merge_stats([merged.get(key, {}), value])
+            elif 'max' in key or key in _STAT_MAXIMA:
+                merged[key] = max(merged.get(key, 0), value)
+            elif isinstance(value, (int, float)):
+                merged[key] = merged.get(key, 0) + value
+            else:
+                merged[key] = value
+
+    for key, (total_key, count_key) in _STAT_AVERAGES.items():
+        if key in merged:
+            count = merged.get(count_key, 0)
+            merged[key] = merged.get(total_key, 0) / count if count else 0
+
+    return merged
+
+
+def _extract_shard(embed_urls: List[str], config: Dict):
+    """
+    Worker process entry point: run one extractor with its own browser
+
+    Returns:
+        tuple: (results, stats) for the shard
+    """
+    async def run():
+        extractor = M3U8Extractor(config)
+        try:
+            results = await extractor.extract(embed_urls)
+            return results, extractor.get_stats()
+        finally:
+            await extractor.close()
+
+    return asyncio.run(run())
+
+
+class ShardedExtractor:
+    """
+    Spread extraction over several processes, each running its own
+    M3U8Extractor and Chromium instance
+
+    A single event loop and Playwright driver pipe top out at a few cores;
+    sharding lets large runs use the whole machine. URLs are dealt round-robin
+    so slow hosts that appear in runs are spread over all shards. Results come
+    back in input order and get_stats() has the same shape as
+    M3U8Extractor.get_stats(). `concurrency` applies per process.
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Args:
+            config: M3U8Extractor configuration; `processes` sets the number of
+                shards and defaults to the CPU count here
+        """
+        self.config = {**(config or {})}
+        self.processes = self.config.get('processes') or os.cpu_count() or 1
+        self.stats: Dict = {}
+
+    async def extract(self, embed_urls: List[str]) -> List[Dict]:
+        """
+        Extract M3U8 URLs across worker processes
+
+        Args:
+            embed_urls: List of embed page URLs
+
+        Returns:
+            list: List of result dictionaries, in input order
+        """
+        if not embed_urls:
+            return []
+
+        processes = min(self.processes, len(embed_urls))
+        shards = [embed_urls[i::processes] for i in range(processes)]
+        shard_config = {**self.config, 'processes': 1}
+
+        self.log(f'Extracting M3U8 from {len(embed_urls)} embeds across {processes} processes...')
+
+        loop = asyncio.get_running_loop()
+        # spawn rather than fork: the parent may already run an event loop and
+        # Playwright's driver threads, neither of which survive a fork
+        with ProcessPoolExecutor(max_workers=processes,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            shard_outputs = await asyncio.gather(*(
+                loop.run_in_executor(executor, _extract_shard, shard, shard_config)
+                for shard in shards
+            ))
+
+        results: List[Optional[Dict]] = [None] * len(embed_urls)
+        for shard_index, (shard_results, _) in enumerate(shard_outputs):
+            results[shard_index::processes] = shard_results
+
+        self.stats = merge_stats([self.stats] + [stats for _, stats in shard_outputs])
+        self.log(f'Extraction complete: {self.stats["successful"]} successful, {self.stats["failed"]} failed')
+
+        return results
+
+    async def close(self):
+        """Worker processes close their own browsers; kept for API parity"""
+
+    def get_stats(self) -> Dict:
+        """Get extraction statistics merged over all shards"""
+        return dict(self.stats)
+
+    def reset_stats(self):
+        """Reset statistics"""
+        self.stats = {}
+
+    def log(self, message: str):
+        """Log message if verbose enabled"""
+        if self.config.get('verbose'):
+            print(f'[M3U8-Extractor] {message}')
+
+
 async def extract_m3u8(embed_urls: List[str], config: Optional[Dict] = None) -> List[Dict]:
     """
     Convenience function for one-time extraction
 
+    Uses a ShardedExtractor when config['processes'] is greater than 1.
+
     Args:
         embed_urls: List of embed page URLs
         config: Configuration dictionary
@@ -298,7 +2674,10 @@ async def extract_m3u8(embed_urls: List[str], config: Optional[Dict] = None) ->
     Returns:
         list: List of result dictionaries
     """
-    extractor = M3U8Extractor(config)
+    if (config or {}).get('processes', 1) > 1:
+        extractor = ShardedExtractor(config)
+    else:
+        extractor = M3U8Extractor(config)
 
     try:
         results = await extractor.extract(embed_urls)
@@ -309,6 +2688,27 @@ async def extract_m3u8(embed_urls: List[str], config: Optional[Dict] = None) ->
         raise error
 
 
+async def extract_m3u8_iter(embed_urls: Union[List[str], AsyncIterable[str]],
+                            config: Optional[Dict] = None) -> AsyncIterator[Dict]:
+    """
+    Convenience async generator for one-time streaming extraction
+
+    Args:
+        embed_urls: List of embed page URLs, or an async iterable of them
+        config: Configuration dictionary
+
+    Yields:
+        dict: Result dictionaries in completion order
+    """
+    extractor = M3U8Extractor(config)
+
+    try:
+        async for result in extractor.extract_iter(embed_urls):
+            yield result
+    finally:
+        await extractor.close()
+
+
 # Example usage
 if __name__ == '__main__':
     async def main():
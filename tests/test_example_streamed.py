@@ -0,0 +1,271 @@
+"""
+Tests for the streamed.pk client in example_streamed, against a local
+aiohttp stand-in of the API
+
+Run with:
+    python -m pytest tests
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import example_streamed
+from example_streamed import SNAPSHOT_MAX_AGE, StreamedAPI, classify_source, get_streamed_matches, resolve_streams
+
+MATCHES = [
+    {'title': 'A vs B', 'category': 'football',
+     'sources': [{'source': 'alpha', 'id': 'ab'}, {'source': 'bravo', 'id': 'ab'}]},
+    # Lists alpha/ab again: it must be looked up once and reused
+    {'title': 'A vs B (replay)', 'sources': [{'source': 'alpha', 'id': 'ab'}]},
+    {'title': 'C vs D', 'sources': [{'source': 'alpha', 'id': 'flaky'}]},
+    {'title': 'E vs F', 'sources': [{'source': 'alpha', 'id': 'gone'}]},
+]
+
+
+class StandIn:
+    """
+    Stand-in for the streamed.pk API
+
+    /api/stream/<source>/flaky fails with a 503 on its first request and
+    /api/stream/<source>/gone is a 404. The /cache/* endpoints answer with
+    the caching headers their names describe.
+    """
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.hits = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.conditional = []
+        self.app = web.Application()
+        self.app.router.add_get('/api/matches/live', self.live)
+        self.app.router.add_get('/api/stream/{source}/{id}', self.stream)
+        self.app.router.add_get('/cache/etag', self.etag)
+        self.app.router.add_get('/cache/max-age', self.max_age)
+        self.app.router.add_get('/cache/no-store', self.no_store)
+
+    def count(self, request):
+        self.hits[request.path] = self.hits.get(request.path, 0) + 1
+        return self.hits[request.path]
+
+    async def live(self, request):
+        self.count(request)
+        return web.json_response(MATCHES, headers={'Cache-Control': 'no-store'})
+
+    async def stream(self, request):
+        hits = self.count(request)
+        source, source_id = request.match_info['source'], request.match_info['id']
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        if source_id == 'gone':
+            raise web.HTTPNotFound()
+        if source_id == 'flaky' and hits == 1:
+            raise web.HTTPServiceUnavailable()
+        return web.json_response([{'embedUrl': f'https://embed.example/{source}/{source_id}'}],
+                                 headers={'Cache-Control': 'no-store'})
+
+    async def etag(self, request):
+        self.count(request)
+        self.conditional.append(request.headers.get('If-None-Match'))
+        headers = {'ETag': '"v1"', 'Cache-Control': 'max-age=0'}
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304, headers=headers)
+        return web.json_response({'version': 1}, headers=headers)
+
+    async def max_age(self, request):
+        self.count(request)
+        return web.json_response({'fresh': True}, headers={'Cache-Control': 'max-age=60'})
+
+    async def no_store(self, request):
+        self.count(request)
+        return web.json_response({'private': True}, headers={'Cache-Control': 'no-store'})
+
+
+@asynccontextmanager
+async def stand_in(**kwargs):
+    """Run a StandIn on an ephemeral port, yielding it with its base URL"""
+    api = StandIn(**kwargs)
+    server = TestServer(api.app)
+    await server.start_server()
+    try:
+        yield api, str(server.make_url('')).rstrip('/')
+    finally:
+        await server.close()
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(example_streamed, 'RETRY_BACKOFF', 0)
+
+
+def test_resolve_streams_fetches_duplicate_pairs_once():
+    async def main():
+        async with stand_in() as (server, base):
+            async with StreamedAPI(base, cache_dir=None) as api:
+                streams = await resolve_streams(api, [('alpha', 'ab'), ('bravo', 'ab'), ('alpha', 'ab')])
+        return server, streams
+
+    server, streams = run(main())
+    assert list(streams) == [('alpha', 'ab'), ('bravo', 'ab')]
+    assert streams[('alpha', 'ab')] == [{'embedUrl': 'https://embed.example/alpha/ab'}]
+    assert server.hits == {'/api/stream/alpha/ab': 1, '/api/stream/bravo/ab': 1}
+
+
+def test_resolve_streams_bounds_concurrency():
+    pairs = [('alpha', f'id{i}') for i in range(12)]
+
+    async def main():
+        async with stand_in(delay=0.05) as (server, base):
+            async with StreamedAPI(base, cache_dir=None) as api:
+                streams = await resolve_streams(api, pairs, concurrency=3)
+        return server, streams
+
+    server, streams = run(main())
+    assert len(streams) == 12 and all(streams.values())
+    assert server.max_in_flight == 3
+
+
+def test_server_errors_are_retried(monkeypatch):
+    no_backoff(monkeypatch)
+
+    async def main():
+        async with stand_in() as (server, base):
+            async with StreamedAPI(base, cache_dir=None) as api:
+                streams = await resolve_streams(api, [('alpha', 'flaky')])
+        return server, streams
+
+    server, streams = run(main())
+    assert streams[('alpha', 'flaky')] == [{'embedUrl': 'https://embed.example/alpha/flaky'}]
+    assert server.hits['/api/stream/alpha/flaky'] == 2
+
+
+def test_missing_streams_are_skipped_without_retry(monkeypatch):
+    no_backoff(monkeypatch)
+
+    async def main():
+        async with stand_in() as (server, base):
+            async with StreamedAPI(base, cache_dir=None) as api:
+                streams = await resolve_streams(api, [('alpha', 'gone'), ('alpha', 'ab')])
+        return server, streams
+
+    server, streams = run(main())
+    assert streams[('alpha', 'gone')] is None
+    assert streams[('alpha', 'ab')]
+    assert server.hits['/api/stream/alpha/gone'] == 1
+
+
+def test_get_streamed_matches(monkeypatch, tmp_path):
+    no_backoff(monkeypatch)
+    # The default API cache directory is relative to the working directory
+    monkeypatch.chdir(tmp_path)
+
+    async def main():
+        async with stand_in() as (server, base):
+            sources = await get_streamed_matches(base, concurrency=2)
+        return server, sources
+
+    server, sources = run(main())
+    assert [(source['match'], source['source'], source['sourceId']) for source in sources] == [
+        ('A vs B', 'alpha', 'ab'),
+        ('A vs B', 'bravo', 'ab'),
+        ('A vs B (replay)', 'alpha', 'ab'),
+        ('C vs D', 'alpha', 'flaky'),
+    ]
+    assert server.hits['/api/stream/alpha/ab'] == 1
+    assert server.max_in_flight <= 2
+
+
+def test_cache_revalidates_with_etag(tmp_path):
+    async def main():
+        async with stand_in() as (server, base):
+            async with StreamedAPI(base, cache_dir=str(tmp_path)) as api:
+                first = await api.get_json('/cache/etag')
+                second = await api.get_json('/cache/etag')
+        return server, api, first, second
+
+    server, api, first, second = run(main())
+    assert first == second == {'version': 1}
+    assert server.conditional == [None, '"v1"']
+    assert api.stats['downloads'] == 1
+    assert api.stats['revalidated'] == 1
+    assert api.stats['bytes_saved'] == api.stats['bytes_downloaded']
+
+
+def test_cache_serves_fresh_entries_without_a_request(tmp_path):
+    async def main():
+        async with stand_in() as (server, base):
+            async with StreamedAPI(base, cache_dir=str(tmp_path)) as api:
+                await api.get_json('/cache/max-age')
+            # A second client (e.g. the next cron run) shares the directory
+            async with StreamedAPI(base, cache_dir=str(tmp_path)) as other:
+                body = await other.get_json('/cache/max-age')
+        return server, other, body
+
+    server, other, body = run(main())
+    assert body == {'fresh': True}
+    assert server.hits['/cache/max-age'] == 1
+    assert other.stats['fresh_hits'] == 1
+    assert other.stats['requests'] == 0
+
+
+def test_cache_never_stores_no_store(tmp_path):
+    async def main():
+        async with stand_in() as (server, base):
+            async with StreamedAPI(base, cache_dir=str(tmp_path)) as api:
+                await api.get_json('/cache/no-store')
+                await api.get_json('/cache/no-store')
+        return server, api
+
+    server, api = run(main())
+    assert server.hits['/cache/no-store'] == 2
+    assert api.stats['downloads'] == 2
+    assert os.listdir(tmp_path) == []
+
+
+def test_cache_freshness_matches_the_asset_cache():
+    api = StreamedAPI(cache_dir=None)
+    date = 'Thu, 01 Jan 2026 00:00:00 GMT'
+    assert api._freshness('/api/stream/a/b', {'Expires': 'Thu, 01 Jan 2026 00:02:00 GMT', 'Date': date}) == 120
+    assert api._freshness('/api/stream/a/b', {'Cache-Control': 'max-age=30'}) == 30
+    # s-maxage is for shared caches, not this client: the endpoint TTL applies
+    assert api._freshness('/api/stream/a/b', {'Cache-Control': 's-maxage=30'}) == 300
+    assert api._freshness('/api/matches/live', {}) == 60
+    assert api._freshness('/api/stream/a/b', {'Cache-Control': 'private, max-age=30'}) is None
+    assert api._freshness('/api/stream/a/b', {'Cache-Control': 'max-age=30', 'Vary': 'Cookie'}) is None
+    assert api._freshness('/api/stream/a/b', {'Cache-Control': 'max-age=30', 'Vary': 'Accept-Encoding'}) == 30
+
+
+def snapshot_entry(m3u8_url, extracted_at):
+    return {'alpha/ab': {'embedUrl': 'https://embed.example/alpha/ab', 'match': 'A vs B',
+                         'result': {'m3u8Url': m3u8_url}, 'extractedAt': extracted_at}}
+
+
+SOURCE = {'source': 'alpha', 'sourceId': 'ab', 'embedUrl': 'https://embed.example/alpha/ab'}
+
+
+def test_classify_source_ages_out_unsigned_results():
+    url = 'https://cdn.example/live/index.m3u8'
+    assert classify_source(snapshot_entry(url, time.time()), SOURCE) == 'unchanged'
+    assert classify_source(snapshot_entry(url, time.time() - SNAPSHOT_MAX_AGE - 1), SOURCE) == 'unresolved'
+    # Snapshots written before entries were timestamped
+    assert classify_source(snapshot_entry(url, None), SOURCE) == 'unresolved'
+
+
+def test_classify_source_trusts_signed_expiry():
+    fresh = f'https://cdn.example/live/index.m3u8?expires={int(time.time()) + 3600}'
+    stale = f'https://cdn.example/live/index.m3u8?expires={int(time.time()) - 1}'
+    assert classify_source(snapshot_entry(fresh, None), SOURCE) == 'unchanged'
+    assert classify_source(snapshot_entry(stale, time.time()), SOURCE) == 'unresolved'
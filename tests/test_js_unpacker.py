@@ -0,0 +1,94 @@
+"""
+Tests for js_unpacker
+
+The packed samples are real Dean Edwards packer output in its Normal
+(radix 62), Numeric (36) and High ASCII (95) encodings; evaluating them
+in Node.js yields SOURCE.
+"""
+
+import pytest
+
+import js_unpacker
+
+SOURCE = (
+    "var player=new Clappr.Player({source:'https://cdn.example.com/live/stream_1/index.m3u8',"
+    "parentId:'#player',autoPlay:true});player.play();"
+)
+
+PACKED_36 = (
+    "eval(function(p,a,c,k,e,d){e=function(c){return c.toString(36)};if(!''.replace(/^/,String)){while(c--){d[c.toString(a)]=k[c]||c.toString(a)}k=[function(e){return d[e]}];e=function(){return'\\\\w+'};c=1};while(c--){if(k[c]){p=p.replace(new RegExp('\\\\b'+e(c)+'\\\\b','g'),k[c])}}return p}('0 1=2 3.4({5:\\'6://7.8.9/a/b/c.d\\',e:\\'#1\\',f:g});1.h();',36,18,'var|player|new|Clappr|Player|source|https|cdn|example|com|live|stream_1|index|m3u8|parentId|autoPlay|true|play'.split('|'),0,{}))"
+)
+
+PACKED_62 = (
+    "eval(function(p,a,c,k,e,d){e=function(c){return(c<a?'':e(parseInt(c/a)))+((c=c%a)>35?String.fromCharCode(c+29):c.toString(36))};if(!''.replace(/^/,String)){while(c--){d[e(c)]=k[c]||e(c)}k=[function(e){return d[e]}];e=function(){return'\\\\w+'};c=1};while(c--){if(k[c]){p=p.replace(new RegExp('\\\\b'+e(c)+'\\\\b','g'),k[c])}}return p}('0 1=2 3.4({5:\\'6://7.8.9/a/b/c.d\\',e:\\'#1\\',f:g});1.h();',62,18,'var|player|new|Clappr|Player|source|https|cdn|example|com|live|stream_1|index|m3u8|parentId|autoPlay|true|play'.split('|'),0,{}))"
+)
+
+PACKED_95 = (
+    "eval(function(p,a,c,k,e,d){e=function(c){return(c<a?'':e(c/a))+String.fromCharCode(c%a+161)};if(!''.replace(/^/,String)){while(c--){d[e(c)]=k[c]||e(c)}k=[function(e){return d[e]}];e=function(){return'[\\\\xa1-\\\\xff]+'};c=1};while(c--){if(k[c]){p=p.replace(new RegExp(e(c),'g'),k[c])}}return p}('¡ ¢=£ ¤.¥({¦:\\'§://¨.©.ª/«/¬/\xad.®\\',¯:\\'#¢\\',°:±});¢.²();',95,18,'var|player|new|Clappr|Player|source|https|cdn|example|com|live|stream_1|index|m3u8|parentId|autoPlay|true|play'.split('|'),0,{}))"
+)
+
+# Packed twice; the inner script is "var src='https://edge.example.net/hls/main.m3u8';"
+PACKED_NESTED = (
+    "eval(function(p,a,c,k,e,d){e=function(c){return(c<a?'':e(parseInt(c/a)))+((c=c%a)>35?String.fromCharCode(c+29):c.toString(36))};if(!''.replace(/^/,String)){while(c--){d[e(c)]=k[c]||e(c)}k=[function(e){return d[e]}];e=function(){return'\\\\w+'};c=1};while(c--){if(k[c]){p=p.replace(new RegExp('\\\\b'+e(c)+'\\\\b','g'),k[c])}}return p}('0(1(2,3,4,5,6,7){6=1(4){8(4<3?\\'\\':6(9(4/3)))+((4=4%3)>a?b.c(4+d):4.e(f))};g(!\\'\\'.h(/^/,b)){i(4--){7[6(4)]=5[4]||6(4)}5=[1(6){8 7[6]}];6=1(){8\\'\\\\\\\\j+\\'};4=k};i(4--){g(5[4]){2=2.h(l m(\\'\\\\\\\\n\\'+6(4)+\\'\\\\\\\\n\\',\\'o\\'),5[4])}}8 2}(\\'p k=\\\\\\'q://r.s.t/u/v.w\\\\\\';\\',x,y,\\'z|A|B|C|D|E|F|G|H\\'.I(\\'|\\'),p,{}))',62,45,'eval|function|p|a|c|k|e|d|return|parseInt|35|String|fromCharCode|29|toString|36|if|replace|while|w|1|new|RegExp|b|g|0|2|3|4|5|6|7|8|62|9|var|src|https|edge|example|net|hls|main|m3u8|split'.split('|'),0,{}))"
+)
+
+
+@pytest.mark.parametrize('packed', [PACKED_36, PACKED_62, PACKED_95], ids=['radix36', 'radix62', 'radix95'])
+def test_unpack(packed):
+    assert js_unpacker.detect(packed)
+    assert js_unpacker.unpack(packed) == SOURCE
+
+
+def test_unpack_all_follows_nested_packing():
+    unpacked = js_unpacker.unpack_all(f'<script>{PACKED_NESTED}</script>')
+    assert len(unpacked) == 2
+    assert js_unpacker.detect(unpacked[0])
+    assert unpacked[1] == "var src='https://edge.example.net/hls/main.m3u8';"
+
+
+def test_multi_digit_words():
+    assert js_unpacker._unbaser(36)('10') == 36
+    assert js_unpacker._unbaser(62)('1A') == 62 + 36
+    assert js_unpacker._unbaser(95)('\xa2\xa1') == 95
+
+
+def test_unpack_rejects_symbol_count_mismatch():
+    packed = PACKED_62.replace(",62,18,", ",62,19,")
+    with pytest.raises(ValueError, match='Symbol table has 18 entries, expected 19'):
+        js_unpacker.unpack(packed)
+    # unpack_all skips payloads it cannot decode
+    assert js_unpacker.unpack_all(packed) == []
+
+
+def test_unpack_rejects_malformed_input():
+    assert not js_unpacker.detect('var a = 1;')
+    with pytest.raises(ValueError, match='No packed payload found'):
+        js_unpacker.unpack('var a = 1;')
+    # Truncated before the symbol table
+    truncated = PACKED_62[:PACKED_62.index(",62,18,")]
+    with pytest.raises(ValueError, match='not recognised'):
+        js_unpacker.unpack(truncated)
+
+
+def test_decode_escapes():
+    assert js_unpacker.decode_escapes(r'https:\x2f\x2fcdn.example.com') == 'https://cdn.example.com'
+
+
+def test_decode_base64_literals():
+    source = "var u = atob('aHR0cHM6Ly9jZG4uZXhhbXBsZS5jb20vaW5kZXgubTN1OA=='); atob('!!!');"
+    assert js_unpacker.decode_base64_literals(source) == ['https://cdn.example.com/index.m3u8']
+
+
+def test_join_concatenations():
+    assert js_unpacker.join_concatenations("'https://' + 'cdn.example.com' + \"/a\"") == \
+        "'https://cdn.example.com' + \"/a\""
+
+
+def test_deobfuscate_recovers_hidden_urls():
+    source = (f'{PACKED_62}\n'
+              "var a = 'https:\\x2f\\x2fedge.example.net/' + 'live/index.m3u8';\n"
+              "var b = atob('aHR0cHM6Ly9jZG4uZXhhbXBsZS5jb20vYi5tM3U4');")
+    text = js_unpacker.deobfuscate(source)
+    assert 'https://cdn.example.com/live/stream_1/index.m3u8' in text
+    assert 'https://edge.example.net/live/index.m3u8' in text
+    assert 'https://cdn.example.com/b.m3u8' in text
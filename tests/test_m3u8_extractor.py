@@ -0,0 +1,321 @@
+"""
+Unit tests for the browser-independent parts of m3u8_extractor
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from m3u8_extractor import (ContextPool, M3U8Extractor, ResultCache, StrategyRouter, asset_freshness,
+                            merge_stats, playlist_expiry)
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+# ContextPool
+
+def test_pool_serves_waiters_first_come_first_served():
+    async def main():
+        pool = ContextPool(['a'])
+        first = await pool.acquire()
+        order = []
+
+        async def waiter(name):
+            context = await pool.acquire()
+            order.append(name)
+            pool.release(context)
+
+        tasks = [asyncio.ensure_future(waiter(name)) for name in ('w1', 'w2', 'w3')]
+        await asyncio.sleep(0)
+        pool.release(first)
+        await asyncio.gather(*tasks)
+        return order, pool
+
+    order, pool = run(main())
+    assert order == ['w1', 'w2', 'w3']
+    assert pool.in_use == 0
+
+
+def test_pool_release_goes_to_queued_waiter_not_late_caller():
+    async def main():
+        pool = ContextPool(['a'])
+        context = await pool.acquire()
+        queued = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        pool.release(context)
+        # A caller arriving after the release must queue behind the waiter
+        late = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        assert queued.done() and not late.done()
+        pool.release(queued.result())
+        return await late
+
+    assert run(main()) == 'a'
+
+
+def test_pool_cancelled_waiter_does_not_leak_a_context():
+    async def main():
+        pool = ContextPool(['a'])
+        context = await pool.acquire()
+        cancelled = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        # The release drops the cancelled waiter before its handler runs
+        pool.release(context)
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return pool
+
+    pool = run(main())
+    assert pool.in_use == 0
+    assert not pool._waiters
+
+
+def test_pool_cancelled_after_handover_releases_the_context():
+    async def main():
+        pool = ContextPool(['a'])
+        context = await pool.acquire()
+        waiter = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        # Hand the context over and cancel before the waiter gets to run
+        pool.release(context)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return pool, await pool.acquire()
+
+    pool, context = run(main())
+    assert context == 'a'
+    assert pool.in_use == 1
+
+
+def test_pool_limit_holds_back_idle_contexts():
+    async def main():
+        pool = ContextPool(['a', 'b'], limit=1)
+        first = await pool.acquire()
+        second = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        blocked = not second.done()
+        pool.set_limit(2)
+        await asyncio.sleep(0)
+        return first, blocked, second.result()
+
+    first, blocked, second = run(main())
+    assert blocked
+    assert {first, second} == {'a', 'b'}
+
+
+def test_pool_grow_failure_fails_one_waiter():
+    async def main():
+        async def factory():
+            raise RuntimeError('no browser')
+
+        pool = ContextPool(factory=factory, max_size=1)
+        with pytest.raises(RuntimeError, match='no browser'):
+            await asyncio.wait_for(pool.acquire(), 1)
+        return pool
+
+    pool = run(main())
+    assert pool.size == 0
+
+
+def test_pool_discard_lets_the_pool_grow_again():
+    async def main():
+        made = []
+
+        async def factory():
+            made.append(f'c{len(made)}')
+            return made[-1]
+
+        pool = ContextPool(factory=factory, max_size=1)
+        context = await pool.acquire()
+        pool.discard()
+        return context, await asyncio.wait_for(pool.acquire(), 1)
+
+    assert run(main()) == ('c0', 'c1')
+
+
+# asset_freshness
+
+@pytest.mark.parametrize('headers, freshness', [
+    ({'Cache-Control': 'max-age=60'}, 60),
+    ({'cache-control': 'public, max-age=60', 'age': '15'}, 45),
+    ({'cache-control': 'public, immutable'}, 365 * 24 * 3600),
+    ({'expires': 'Thu, 01 Jan 2026 00:01:00 GMT', 'date': 'Thu, 01 Jan 2026 00:00:00 GMT'}, 60),
+    ({'cache-control': 'max-age=60', 'vary': 'Accept-Encoding'}, 60),
+    ({'etag': '"v1"'}, 0),
+    ({'cache-control': 'no-cache', 'last-modified': 'Thu, 01 Jan 2026 00:00:00 GMT'}, 0),
+    ({'expires': '0', 'etag': '"v1"'}, 0),
+])
+def test_asset_freshness(headers, freshness):
+    assert asset_freshness(headers) == pytest.approx(freshness)
+
+
+@pytest.mark.parametrize('headers', [
+    {},
+    {'cache-control': 'no-store, max-age=60'},
+    {'cache-control': 'private, max-age=60'},
+    {'cache-control': 'max-age=60', 'vary': 'Cookie'},
+    {'cache-control': 'max-age=60', 'vary': '*'},
+    {'cache-control': 'no-cache'},
+])
+def test_asset_freshness_not_storable(headers):
+    assert asset_freshness(headers) is None
+
+
+# playlist_expiry / ResultCache
+
+def test_playlist_expiry():
+    assert playlist_expiry('https://cdn/x/index.m3u8?token=a&expires=1900000000') == 1900000000
+    assert playlist_expiry('https://cdn/x/index.m3u8?e=1900000000000') == 1900000000
+    # Small values are flags, not timestamps
+    assert playlist_expiry('https://cdn/x/index.m3u8?e=1') is None
+    assert playlist_expiry('https://cdn/x/index.m3u8') is None
+
+
+def test_result_cache_expiry_and_normalisation(tmp_path):
+    cache = ResultCache(str(tmp_path / 'results.json'), max_entries=10)
+    cache.put('HTTPS://Embed.example/a?b=2&a=1#frag', {'m3u8Url': 'u1'}, time.time() + 60)
+    cache.put('https://embed.example/old', {'m3u8Url': 'u2'}, time.time() - 1)
+
+    assert cache.get('https://embed.example/a?a=1&b=2') == ({'m3u8Url': 'u1'}, False)
+    assert cache.get('https://embed.example/old') == (None, True)
+    assert cache.get('https://embed.example/old') == (None, False)
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache(None, max_entries=2)
+    expires = time.time() + 60
+    cache.put('https://e/1', {'n': 1}, expires)
+    cache.put('https://e/2', {'n': 2}, expires)
+    cache.get('https://e/1')
+    assert cache.put('https://e/3', {'n': 3}, expires) == 1
+    assert cache.get('https://e/2') == (None, False)
+    assert cache.get('https://e/1')[0] == {'n': 1}
+
+
+def test_result_cache_persists(tmp_path):
+    path = tmp_path / 'results.json'
+    cache = ResultCache(str(path), max_entries=10)
+    cache.put('https://e/1', {'n': 1}, time.time() + 60)
+    cache.save()
+
+    assert ResultCache(str(path), max_entries=10).get('https://e/1')[0] == {'n': 1}
+
+
+def test_result_cache_does_not_save_unloaded(tmp_path):
+    path = tmp_path / 'results.json'
+    path.write_text(json.dumps({'https://e/1': {'result': {'n': 1}, 'expires': time.time() + 60}}))
+    ResultCache(str(path), max_entries=10).save()
+    assert 'https://e/1' in json.loads(path.read_text())
+
+
+# StrategyRouter
+
+def test_router_loads_history_on_first_use(tmp_path):
+    path = tmp_path / 'router.json'
+    path.write_text(json.dumps({'h': {'unpack': {'attempts': 4, 'successes': 4, 'time': 40}}}))
+    router = StrategyRouter(['static', 'unpack', 'iframe'], str(path))
+    assert router.plan('h') == ['unpack']
+    router.record('h', 'static', False)
+    router.save()
+    assert json.loads(path.read_text())['h']['static']['attempts'] == 1
+
+
+def test_router_history_survives_a_cache_only_run(tmp_path):
+    history = {'h': {'unpack': {'attempts': 4, 'successes': 4, 'time': 40}}}
+    router_path = tmp_path / 'router.json'
+    router_path.write_text(json.dumps(history))
+    cache_path = tmp_path / 'results.json'
+    cache_path.write_text(json.dumps({'https://h/': {'result': {'m3u8Url': 'https://cdn/i.m3u8'},
+                                                     'expires': time.time() + 60}}))
+
+    async def main():
+        extractor = M3U8Extractor({'router_path': str(router_path), 'result_cache': True,
+                                   'result_cache_path': str(cache_path)})
+        results = await extractor.extract(['https://h/'])
+        await extractor.close()
+        return results
+
+    # Served from the result cache: the browser never starts
+    assert run(main())[0]['m3u8Url'] == 'https://cdn/i.m3u8'
+    assert json.loads(router_path.read_text()) == history
+
+
+# merge_stats
+
+def test_merge_stats():
+    merged = merge_stats([
+        {'successful': 2, 'total_time': 300, 'average_time': 150, 'max_rss': 100, 'init_time': 900,
+         'fast_path': {'host': {'hits': 1, 'attempts': 2, 'hit_rate': 0.5}}},
+        {'successful': 1, 'total_time': 600, 'average_time': 600, 'max_rss': 250, 'init_time': 700,
+         'fast_path': {'host': {'hits': 1, 'attempts': 1, 'hit_rate': 1.0}}},
+    ])
+    assert merged['successful'] == 3
+    assert merged['total_time'] == 900
+    assert merged['average_time'] == 300
+    assert merged['max_rss'] == 250
+    assert merged['init_time'] == 900
+    assert merged['fast_path']['host'] == {'hits': 2, 'attempts': 3, 'hit_rate': pytest.approx(2 / 3)}
+
+
+def test_merge_stats_empty_averages():
+    assert merge_stats([{'successful': 0, 'total_time': 0, 'average_time': 0}])['average_time'] == 0
+
+
+# Pipeline startup
+
+def test_extract_iter_consumes_the_source_while_initializing():
+    events = []
+
+    async def main():
+        extractor = M3U8Extractor({'concurrency': 2})
+
+        async def initialize():
+            events.append('init start')
+            await asyncio.sleep(0.05)
+            extractor.browser = object()
+            for name in ('c1', 'c2'):
+                extractor.pool.add(name)
+            events.append('init done')
+
+        async def extract_pooled(url, attempt):
+            return {'embedUrl': url, 'm3u8Url': f'{url}/index.m3u8', 'success': True, 'time': 0,
+                    'error': None, 'strategy': 'browser'}, False
+
+        async def source():
+            for i in range(3):
+                events.append(f'url {i}')
+                yield f'https://e/{i}'
+
+        extractor.initialize = initialize
+        extractor._extract_pooled = extract_pooled
+        return [result['embedUrl'] async for result in extractor.extract_iter(source())]
+
+    urls = run(main())
+    assert sorted(urls) == ['https://e/0', 'https://e/1', 'https://e/2']
+    # Discovery ran while the browser was starting
+    assert events.index('url 2') < events.index('init done')
+
+
+# Candidate ranking
+
+@pytest.mark.parametrize('path', ['/hls/devastation-live/playlist.m3u8', '/commercial-channel/index.m3u8',
+                                  '/live/loads/index.m3u8'])
+def test_ad_words_inside_names_are_not_penalised(path):
+    extractor = M3U8Extractor()
+    url = f'https://cdn.example.com{path}'
+    assert extractor._best_candidate(extractor._rank_candidates([{'url': url}])) == url
+
+
+def test_ad_playlists_rank_below_content():
+    extractor = M3U8Extractor()
+    ranked = extractor._rank_candidates([{'url': 'https://cdn.example.com/vast/preroll.m3u8'},
+                                         {'url': 'https://cdn.example.com/live/ad-break/index.m3u8'},
+                                         {'url': 'https://cdn.example.com/live/index.m3u8'}])
+    assert extractor._best_candidate(ranked) == 'https://cdn.example.com/live/index.m3u8'
+    assert all(candidate['score'] < extractor.config['candidate_min_score'] for candidate in ranked[1:])
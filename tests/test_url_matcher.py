@@ -0,0 +1,38 @@
+"""
+Tests for URLMatcher and its required-literal prefilter
+"""
+
+import re
+
+from m3u8_extractor import M3U8Extractor, URLMatcher, _required_literal
+
+
+def test_required_literal():
+    assert _required_literal(r'index\.m3u8') == 'index.m3u8'
+    assert _required_literal(r'a{2}b') == 'b'
+    assert _required_literal(r'abc{1,3}def') == 'def'
+    assert _required_literal(r'xy{,2}zzz') == 'zzz'
+    assert _required_literal(r'(foo|bar)\.m3u8') is None
+    # A brace that is not a repeat is left to the regex
+    assert _required_literal(r'ab{x') is None
+
+
+def test_matcher_agrees_with_re_search():
+    patterns = [r'a{2}b', r'seg{3}ment\.m3u8', r'playlist\.m3u8', r'\.M3U8']
+    urls = [
+        'https://h/aab', 'https://h/ab', 'https://h/segggment.m3u8', 'https://h/segment.m3u8',
+        'https://h/PLAYLIST.m3u8?x=1', 'https://h/index.m3u8', 'https://h/app.js',
+    ]
+    matcher = URLMatcher(patterns)
+    for url in urls:
+        expected = any(re.search(pattern, url, re.IGNORECASE) for pattern in patterns)
+        assert matcher.search(url) == expected, url
+
+
+def test_block_patterns_are_wrapped_like_m3u8_patterns():
+    # Joined bare, the inline flag would not be at the start of the regex
+    extractor = M3U8Extractor({'block_url_patterns': [r'ads?\.', r'(?i)TRACKER', r'(a)\1x']})
+    assert extractor.block_matcher.search('https://ads.example/x.js')
+    assert extractor.block_matcher.search('https://h/tracker.js')
+    assert extractor.block_matcher.search('https://h/aax')
+    assert not extractor.block_matcher.search('https://h/app.js')